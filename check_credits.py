@@ -3,12 +3,57 @@ OpenRouter API Key Credits Checker
 Quick utility to check your API key status and remaining credits.
 """
 import os
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1"
+
+# The models list changes rarely - reuse a local copy for a few hours
+MODELS_CACHE_DIR = Path.home() / ".cache" / "openrouter"
+MODELS_CACHE_TTL = 6 * 60 * 60  # seconds
+
+
+def models_cache_path(api_key: str) -> Path:
+    """Cache file for one API key and base URL, so a new key never reports another key's model list."""
+    digest = hashlib.sha256(f"{OPENROUTER_API_URL}\x00{api_key}".encode()).hexdigest()[:16]
+    return MODELS_CACHE_DIR / f"models-{digest}.json"
+
+
+def fetch_models(session: requests.Session, api_key: str):
+    """Return (models, status_code) for /models, served from the key's on-disk cache while it is fresh."""
+    cache_path = models_cache_path(api_key)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < MODELS_CACHE_TTL:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f), 200
+    except (OSError, json.JSONDecodeError):
+        pass  # Missing or unreadable cache - fetch fresh
+    
+    response = session.get(f"{OPENROUTER_API_URL}/models", timeout=10)
+    if response.status_code != 200:
+        return None, response.status_code
+    
+    models = response.json().get("data", [])
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(models, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Caching is best-effort
+    return models, 200
+
+
 def check_openrouter_credits():
     """Check OpenRouter API key status and credits."""
     
@@ -21,17 +66,21 @@ def check_openrouter_credits():
     print(f"🔑 API Key: {api_key[:15]}...{api_key[-4:]}")
     print("-" * 50)
     
-    # Check key validity
-    headers = {"Authorization": f"Bearer {api_key}"}
+    # One pooled session so all three calls reuse the same keep-alive connection
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {api_key}"})
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    
+    # The three endpoints are independent - fire them together, then report in order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        key_future = executor.submit(session.get, f"{OPENROUTER_API_URL}/auth/key", timeout=10)
+        credits_future = executor.submit(session.get, f"{OPENROUTER_API_URL}/credits", timeout=10)
+        models_future = executor.submit(fetch_models, session, api_key)
     
     # 1. Check key info
     print("\n📋 Checking API Key Status...")
     try:
-        response = requests.get(
-            "https://openrouter.ai/api/v1/auth/key",
-            headers=headers,
-            timeout=10
-        )
+        response = key_future.result()
         
         if response.status_code == 200:
             data = response.json().get("data", {})
@@ -61,11 +110,7 @@ def check_openrouter_credits():
     # 2. Check credits/limits
     print("\n💳 Checking Credits & Limits...")
     try:
-        response = requests.get(
-            "https://openrouter.ai/api/v1/credits",
-            headers=headers,
-            timeout=10
-        )
+        response = credits_future.result()
         
         if response.status_code == 200:
             data = response.json().get("data", {})
@@ -87,14 +132,9 @@ def check_openrouter_credits():
     # 3. List available models (sample)
     print("\n🤖 Testing Model Access...")
     try:
-        response = requests.get(
-            "https://openrouter.ai/api/v1/models",
-            headers=headers,
-            timeout=10
-        )
+        models, status_code = models_future.result()
         
-        if response.status_code == 200:
-            models = response.json().get("data", [])
+        if status_code == 200:
             print(f"   ✅ Access to {len(models)} models")
             # Show a few popular models
             popular = ["qwen/qwen3-32b", "anthropic/claude-3.5-sonnet", "openai/gpt-4o", "google/gemini-pro-1.5"]
@@ -106,7 +146,7 @@ def check_openrouter_credits():
                 completion_cost = float(pricing.get("completion", 0)) * 1000000
                 print(f"      • {model_id}: ${prompt_cost:.2f}/$1M in, ${completion_cost:.2f}/$1M out")
         else:
-            print(f"   ⚠️ Could not fetch models: {response.status_code}")
+            print(f"   ⚠️ Could not fetch models: {status_code}")
             
     except requests.exceptions.RequestException as e:
         print(f"   ⚠️ Could not fetch models: {e}")
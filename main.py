@@ -2,22 +2,28 @@
 Main Orchestration Script - Enhanced for Batch Processing
 Processes all PDFs in input folder and provides consolidated JSON output with LLM metrics.
 """
+from __future__ import annotations
+
 import sys
 import os
 import json
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 import click
 
 from src.config import Config
-from src.logger import create_logger
 from src.utils.file_handler import FileHandler
-from src.utils.token_tracker import TokenTracker
-from src.utils.mapping_manager import MappingManager
-from src.extractors.pdf_extractor import PDFExtractor
-from src.extractors.table_extractor import TableExtractor
-from src.cleaners.deterministic_cleaner import DeterministicContentCleaner as TextCleaner
+from src.utils.llm_cache import LLMCache
+from src.utils.extraction_cache import ExtractionCache
+
+# The event loop, process pool, logger and colorama are only needed once a batch runs,
+# so --help, config errors and spawned workers don't pay for importing them
+if TYPE_CHECKING:
+    import asyncio
+    from src.utils.rate_limiter import TokenBucketRateLimiter
 
 
 @click.command()
@@ -28,9 +34,12 @@ from src.cleaners.deterministic_cleaner import DeterministicContentCleaner as Te
 @click.option('--max-tokens', default=None, type=int, help=f'Max output tokens (default: {Config.MAX_TOKENS})')
 @click.option('--extract-only', is_flag=True, help='Stop after extraction, skipping context generation and LLM')
 @click.option('--context-only', is_flag=True, help='Generate full LLM context file but skip LLM call')
-def main(input_path, output_dir, model, temperature, max_tokens, extract_only, context_only):
+@click.option('--workers', default=None, type=click.IntRange(min=1), help='Parallel worker processes (default: one per PDF, up to CPU count)')
+@click.option('--force-reextract', is_flag=True, help='Ignore cached PDF/table extractions and cleaned text from earlier runs')
+@click.option('--cache-mode', default='enabled', type=click.Choice(LLMCache.MODES), help='LLM response cache: enabled, replay (cache only, no LLM calls) or disabled')
+def main(input_path, output_dir, model, temperature, max_tokens, extract_only, context_only, workers, force_reextract, cache_mode):
     """PDF Extraction & Retailer Hub Field Mapping System - Batch Processing"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Validate and configure
     try:
@@ -53,19 +62,13 @@ def main(input_path, output_dir, model, temperature, max_tokens, extract_only, c
         click.echo(f"❌ Error reading input: {e}", err=True)
         sys.exit(1)
 
-    # Determine output naming prefix
-    folder_prefix = FileHandler.resolve_prefix(input_path, pdf_files)
-    
-    # We will create loggers per file subsequently
-    
-    # Configure DSPy (initial check)
-    # configure_dspy(logger) # Defer to loop
+    # Loggers are created per file inside the workers; DSPy is configured once before the LLM stage
     
     # Initialize metrics aggregation
     all_results = []
     metrics = {
         "total_pdfs": 0, "successful": 0, "failed": 0,
-        "total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0, "total_cost": 0.0,
+        "total_input_tokens": 0, "total_output_tokens": 0, "total_cached_tokens": 0, "total_tokens": 0, "total_cost": 0.0,
         "model": Config.DEFAULT_MODEL, "per_file_metrics": []
     }
     
@@ -79,8 +82,19 @@ def main(input_path, output_dir, model, temperature, max_tokens, extract_only, c
     
     # Create per-file output for each PDF
     input_path_obj = Path(input_path).resolve()
-    run_timestamp = datetime.now().strftime("%d%m%Y_%H%M%S")  # Date+Time for this run
-    
+    # One clock reading names everything this run writes (per-file folders and batch summary files)
+    run_started = datetime.now()
+    run_timestamp = run_started.strftime("%d%m%Y_%H%M%S")  # Date+Time for this run
+    should_stop_early = extract_only or context_only
+    
+    # Each PDF is independent: preparation fans out over worker processes (PDF parsing/cleaning
+    # is CPU-bound and needs processes to escape the GIL) while the network-bound LLM stage runs
+    # on one event loop in this process. A PDF enters the LLM stage as soon as it is prepared.
+    max_workers = workers or min(len(pdf_files), os.cpu_count() or 1)
+    # Cores the batch pool leaves idle (e.g. one large PDF) go to splitting pages within a PDF
+    page_workers = Config.PDF_PAGE_WORKERS or max(1, (os.cpu_count() or 1) // max_workers)
+    
+    jobs = []
     for idx, pdf_file in enumerate(pdf_files, 1):
         output_folder_name = FileHandler.get_output_folder_name(pdf_file, input_path_obj, run_timestamp)
         
@@ -90,59 +104,99 @@ def main(input_path, output_dir, model, temperature, max_tokens, extract_only, c
         
         # 2. Filter XLSX files: Only use those in the SAME directory as the PDF
         local_xlsx_files = [x for x in xlsx_files if x.parent == pdf_file.parent]
-
-        # Initialize logger for this file
-        logger = create_logger(file_output_path, console_enabled=True)
-        
-        # Log visual separator
-        logger.info("\n" + "="*80, console_only=True)
-        logger.info(f"PROCESSING FILE {idx}/{len(pdf_files)}: {pdf_file.name}".center(80), console_only=True)
-        logger.info("="*80 + "\n", console_only=True)
         
-        logger.log_processing_start(pdf_file)
+        jobs.append({
+            "pdf_file": pdf_file, "output_path": file_output_path, "xlsx_files": local_xlsx_files,
+            "idx": idx, "total": len(pdf_files), "stop_early": should_stop_early,
+            "force_reextract": force_reextract, "page_workers": page_workers
+        })
+    
+    if max_workers > 1:
+        click.echo(f"⚙️  Processing with {max_workers} worker process(es)")
+    llm_cache = LLMCache(Config.LLM_CACHE_DIR, mode=cache_mode)
+    import asyncio
+    outcomes = asyncio.run(run_batch(jobs, max_workers, llm_cache))
+    
+    # Aggregate in input order so the summary is stable regardless of completion order
+    for idx in sorted(outcomes):
+        result, file_metrics = outcomes[idx]
         
-        try:
-            # Determine if we should stop early
-            should_stop_early = extract_only or context_only
-            
-            # Configure DSPy for this run (logger might change), ONLY if running full pipeline
-            if not should_stop_early:
-                configure_dspy(logger)
-                logger.log_model_params(Config.get_model_params())
-            result, file_metrics = process_pdf(pdf_file, file_output_path, local_xlsx_files, logger, idx, should_stop_early)
-            
-            if should_stop_early:
-                logger.success(f"✓ Context generation completed for {pdf_file.name} (Skipped LLM)")
-                logger.info(f"✅ Output saved to: {file_output_path}")
-                metrics["successful"] += 1
-                continue
-
-            all_results.append(result)
-            metrics["per_file_metrics"].append(file_metrics)
-            metrics["successful"] += 1
-            
-            # Aggregate
-            metrics["total_input_tokens"] += file_metrics["input_tokens"]
-            metrics["total_output_tokens"] += file_metrics["output_tokens"]
-            metrics["total_tokens"] += file_metrics["total_tokens"]
-            metrics["total_cost"] += file_metrics["cost"]
-            
-            logger.log_processing_complete(file_output_path / "final_output", file_metrics["processing_time_seconds"])
-            
-        except Exception as e:
-            logger.error(f"Failed to process {pdf_file.name}: {str(e)}")
+        if file_metrics["status"] == "failed":
             metrics["failed"] += 1
-            metrics["per_file_metrics"].append({"file": pdf_file.name, "status": "failed", "error": str(e)})
+            metrics["per_file_metrics"].append(file_metrics)
+            continue
+        
+        metrics["successful"] += 1
+        if file_metrics["status"] == "context_generated":
+            continue
+        
+        all_results.append(result)
+        metrics["per_file_metrics"].append(file_metrics)
+        
+        # Aggregate
+        metrics["total_input_tokens"] += file_metrics["input_tokens"]
+        metrics["total_output_tokens"] += file_metrics["output_tokens"]
+        metrics["total_cached_tokens"] += file_metrics["cached_tokens"]
+        metrics["total_tokens"] += file_metrics["total_tokens"]
+        metrics["total_cost"] += file_metrics["cost"]
 
     # Save consolidated output (in the last created folder or a summary folder?)
     # Saving to the output_dir root for summary
-    metrics["processing_time_seconds"] = round(time.time() - start_time, 2)
-    save_consolidated_output(Path(output_dir), all_results, metrics)
+    metrics["processing_time_seconds"] = round(time.perf_counter() - start_time, 2)
+    save_consolidated_output(Path(output_dir), all_results, metrics, run_started.strftime('%d%m%Y%H%M'))
     
     print_summary(metrics)
     click.echo(f"\n✅ Batch Processing Complete! Output Root: {output_dir}")
 
 
+def init_worker(model: str, temperature: float, max_tokens: int):
+    """Re-apply CLI overrides in a worker process (spawned workers re-import Config)."""
+    Config.DEFAULT_MODEL = model
+    Config.TEMPERATURE = temperature
+    Config.MAX_TOKENS = max_tokens
+
+
+def process_pdf_worker(job: dict) -> dict:
+    """
+    Run the CPU-bound preparation stages for one PDF. Top-level so it can be sent to a
+    worker process. The logger is created here because loggers (open file handles) are
+    not picklable. Returns the prepared context; failures are reported via "status".
+    """
+    pdf_file = job["pdf_file"]
+    file_output_path = job["output_path"]
+    stop_early = job["stop_early"]
+    
+    from src.logger import create_logger
+    
+    # Initialize logger for this file
+    logger = create_logger(file_output_path, console_enabled=True)
+    
+    # Log visual separator
+    logger.info("\n" + "="*80, console_only=True)
+    logger.info(f"PROCESSING FILE {job['idx']}/{job['total']}: {pdf_file.name}".center(80), console_only=True)
+    logger.info("="*80 + "\n", console_only=True)
+    
+    logger.log_processing_start(pdf_file)
+    
+    try:
+        extraction_cache = ExtractionCache(Config.EXTRACT_CACHE_DIR, refresh=job["force_reextract"])
+        context = process_pdf(pdf_file, file_output_path, job["xlsx_files"], logger, job["idx"], stop_early, extraction_cache,
+                              job["page_workers"])
+        
+        if stop_early:
+            logger.success(f"✓ Context generation completed for {pdf_file.name} (Skipped LLM)")
+            logger.info(f"✅ Output saved to: {file_output_path}")
+        return context
+        
+    except Exception as e:
+        logger.error(f"Failed to process {pdf_file.name}: {str(e)}")
+        return {"pdf_file": pdf_file, "status": "failed", "error": str(e)}
+    
+    finally:
+        # Flush before the parent reopens this log for the LLM stage
+        logger.close()
+
+
 def configure_dspy(logger):
     """Configure DSPy with OpenRouter LLM."""
     import dspy # Lazy import to avoid loading issues if not used
@@ -165,9 +219,6 @@ def configure_dspy(logger):
         #global state setting
         dspy.configure(lm=lm)
         logger.success(f"DSPy configured with model: {Config.DEFAULT_MODEL}")
-        
-        # Log model parameters
-        logger.log_model_params(Config.get_model_params())
     
     except Exception as e:
         logger.error(f"DSPy configuration failed: {str(e)}")
@@ -189,76 +240,143 @@ def configure_dspy(logger):
             pass
         raise e
 
-def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, file_idx: int, stop_early: bool = False):
-    """Process single PDF and return results + metrics."""
+@lru_cache(maxsize=None)
+def get_extractors():
+    """
+    PDF and table extractors for this process, created on first use and reused for every PDF
+    (TableExtractor sets up the Tesseract OCR backend in __init__). Each worker process builds its own.
+    """
+    # Lazy imports: pdfplumber/PyMuPDF/img2table are only needed once a PDF is actually extracted
+    from src.extractors.pdf_extractor import PDFExtractor
+    from src.extractors.table_extractor import TableExtractor
+    return PDFExtractor(), TableExtractor()
+
+
+@lru_cache(maxsize=32)
+def _read_xlsx_cached(xlsx_path: Path, mtime_ns: int, size: int) -> str:
+    """XLSX text keyed by the file's identity; mtime and size make an edited workbook miss."""
+    return FileHandler.xlsx_to_text(xlsx_path)
+
+
+def read_xlsx(xlsx_path: Path) -> str:
+    """
+    XLSX text, parsed once per process: every PDF in a folder gets the same workbooks,
+    and a worker process usually prepares several of them.
+    """
+    try:
+        stat = xlsx_path.stat()
+    except OSError:
+        return FileHandler.xlsx_to_text(xlsx_path)  # Reports the read error as text
+    return _read_xlsx_cached(xlsx_path, stat.st_mtime_ns, stat.st_size)
+
+
+def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, file_idx: int, stop_early: bool = False,
+                extraction_cache: ExtractionCache = None, page_workers: int = 1) -> dict:
+    """Run stages 1-3 for a single PDF and return the prepared LLM context."""
+    # Lazy import: only needed once a PDF is actually processed
+    from src.cleaners.deterministic_cleaner import DeterministicContentCleaner as TextCleaner
+    from src.extractors.pdf_context import PdfDocumentContext
+    
+    # Wall-clock time: the LLM stage finishes the file in the parent process, and perf_counter
+    # values are not comparable across processes
     file_start = time.time()
     
     # Define subdirectories
     file_extracted_dir = output_root / "extracted_text"
     file_cleaned_dir = output_root / "llm_context"
-    final_root = output_root / "final_output"
     
     file_extracted_dir.mkdir(parents=True, exist_ok=True)
     file_cleaned_dir.mkdir(parents=True, exist_ok=True)
-    if not stop_early:
-        final_root.mkdir(parents=True, exist_ok=True)
     
-    # Initialize Mapping Manager
-    mapping_manager = MappingManager(
-        fsn_mapping_path="mapping/FSN Model mapping.xlsx.ods",
-        ls_mapping_path="mapping/DMRP data_Lifestyle 24-25.ods",
-        logger=logger
-    )
-    
-    # =========================================================================
-    # STAGE 1: PDF TEXT EXTRACTION
-    # =========================================================================
-    stage_start = time.time()
-    logger.log_stage_start(
-        stage_number=1,
-        stage_name="PDF Text Extraction",
-        description="Reading the PDF file and extracting all text content. We use specialized libraries (PyMuPDF or pdfplumber) to read the PDF pages and convert them to plain text. If the PDF contains scanned images instead of text, we automatically fall back to OCR (Optical Character Recognition)."
-    )
-    
-    pdf_extractor = PDFExtractor()
-    raw_text, num_pages = pdf_extractor.extract(pdf_file)
-    extraction_method = "PyMuPDF" if hasattr(pdf_extractor, '_method') else "pdfplumber"
-    
-    # Log extraction details
-    logger.log_pdf_extraction_details(
-        pdf_path=str(pdf_file.name),
-        num_pages=num_pages,
-        text_length=len(raw_text),
-        method=extraction_method
-    )
-    
-    FileHandler.save_text(raw_text, file_extracted_dir / f"{pdf_file.stem}_raw.txt")
-    stage_duration = time.time() - stage_start
-    logger.log_stage_end("PDF Text Extraction", stage_duration, f"Extracted {len(raw_text):,} characters from {num_pages} page(s)")
-    
-    # =========================================================================
-    # STAGE 2: TABLE EXTRACTION
-    # =========================================================================
-    stage_start = time.time()
-    logger.log_stage_start(
-        stage_number=2,
-        stage_name="Table Extraction",
-        description="Scanning the PDF for any tables (like FSN lists, discount slabs, or pricing data). Tables contain structured data that is crucial for accurate field extraction. We convert tables to CSV format for easy processing."
-    )
-    
-    table_extractor = TableExtractor()
+    raw_path = file_extracted_dir / f"{pdf_file.stem}_raw.txt"
     table_csv_path = file_extracted_dir / f"{pdf_file.stem}_tables.csv"
-    num_tables = table_extractor.extract_and_consolidate(pdf_file, table_csv_path)
-    table_text = FileHandler.read_file(table_csv_path) if num_tables > 0 else ""
+    
+    # Workbooks don't depend on the PDF - start reading them now so the file I/O and
+    # decompression overlap stages 1-3; the text is collected in stage 4 (map keeps file order)
+    xlsx_results = None
+    if xlsx_files:
+        from concurrent.futures import ThreadPoolExecutor
+        xlsx_executor = ThreadPoolExecutor(max_workers=min(8, len(xlsx_files)))
+        xlsx_results = xlsx_executor.map(read_xlsx, xlsx_files)
+        xlsx_executor.shutdown(wait=False)
+    
+    # Map the PDF once: hashing, text and table extraction all read from the same mapping
+    # instead of each re-reading the file. The mapping and the parsed document are released
+    # after stage 2, on success or error
+    pdf_data = FileHandler.map_file(pdf_file)
+    try:
+        # Stages 1-2 are deterministic per PDF - reuse an earlier run's output when available
+        cache_key = ExtractionCache.make_key(pdf_file, pdf_data, ExtractionCache.extractor_fingerprint()) if extraction_cache else None
+        cached = extraction_cache.load(cache_key, raw_path, table_csv_path) if extraction_cache else None
+    
+        # Both stages parse the same document (opened lazily); tables found while masking them out
+        # of the text in stage 1 are reused in stage 2
+        with PdfDocumentContext(pdf_file, source=pdf_data) as pdf_doc:
+            # =========================================================================
+            # STAGE 1: PDF TEXT EXTRACTION
+            # =========================================================================
+            stage_start = time.perf_counter()
+            logger.log_stage_start(
+                stage_number=1,
+                stage_name="PDF Text Extraction",
+                description="Reading the PDF file and extracting all text content. We use specialized libraries (PyMuPDF or pdfplumber) to read the PDF pages and convert them to plain text. If the PDF contains scanned images instead of text, we automatically fall back to OCR (Optical Character Recognition)."
+            )
+    
+            if cached:
+                logger.info(f"♻️  Reusing cached extraction ({cache_key[:12]})")
+                raw_text = FileHandler.read_file(raw_path)
+                num_pages = cached["num_pages"]
+                extraction_method = cached["method"]
+            else:
+                pdf_extractor, _ = get_extractors()
+                # Pages are streamed to the raw dump as they are extracted
+                raw_text, num_pages = pdf_extractor.extract(pdf_file, raw_path, workers=page_workers, doc=pdf_doc)
+                extraction_method = "PyMuPDF" if hasattr(pdf_extractor, '_method') else "pdfplumber"
+    
+            # Log extraction details
+            logger.log_pdf_extraction_details(
+                pdf_path=str(pdf_file.name),
+                num_pages=num_pages,
+                text_length=len(raw_text),
+                method=extraction_method
+            )
+    
+            stage_duration = time.perf_counter() - stage_start
+            logger.log_stage_end("PDF Text Extraction", stage_duration, f"Extracted {len(raw_text):,} characters from {num_pages} page(s)")
+    
+            # =========================================================================
+            # STAGE 2: TABLE EXTRACTION
+            # =========================================================================
+            stage_start = time.perf_counter()
+            logger.log_stage_start(
+                stage_number=2,
+                stage_name="Table Extraction",
+                description="Scanning the PDF for any tables (like FSN lists, discount slabs, or pricing data). Tables contain structured data that is crucial for accurate field extraction. We convert tables to CSV format for easy processing."
+            )
+    
+            if cached:
+                num_tables = cached["num_tables"]
+                table_text = FileHandler.read_file(table_csv_path) if num_tables > 0 else ""
+            else:
+                _, table_extractor = get_extractors()
+                num_tables, table_text = table_extractor.extract_and_consolidate(pdf_file, table_csv_path, doc=pdf_doc)
+                # Don't pin a degraded result - text OCR failed, or table extraction failed or had no
+                # img2table fallback for a PDF without pdfplumber tables - a later run may do better
+                if extraction_cache and not pdf_extractor.degraded and not table_extractor.degraded:
+                    extraction_cache.store(cache_key, raw_path, table_csv_path,
+                                           {"num_pages": num_pages, "num_tables": num_tables, "method": extraction_method})
+    finally:
+        if pdf_data is not None:
+            pdf_data.close()
     
     logger.log_table_extraction(num_tables)
-    stage_duration = time.time() - stage_start
+    stage_duration = time.perf_counter() - stage_start
     logger.log_stage_end("Table Extraction", stage_duration, f"Found {num_tables} table(s)")
     
     # =========================================================================
     # STAGE 3: TEXT CLEANING
     # =========================================================================
-    stage_start = time.time()
+    stage_start = time.perf_counter()
     logger.log_stage_start(
         stage_number=3,
         stage_name="Text Cleaning",
@@ -266,21 +384,34 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     )
     
     text_cleaner = TextCleaner(logger=logger)
-    cleaned_text = text_cleaner.clean(raw_text)
-    
-    # Get and log cleaning audit
-    audit_summary = text_cleaner.get_audit_summary()
-    if audit_summary["removed"] > 0:
-        logger.log_cleaning_details(
-            removed_items=audit_summary["audit_log"],
-            total_removed=audit_summary["removed"]
-        )
+    
+    # Cleaning is deterministic for a given raw text and rule set - reuse an earlier run's result
+    clean_key = ExtractionCache.make_text_key(raw_text, TextCleaner.rules_fingerprint()) if extraction_cache else None
+    cached_clean = extraction_cache.load_cleaned(clean_key) if extraction_cache else None
+    if cached_clean:
+        logger.info(f"♻️  Reusing cached cleaning ({clean_key[:12]})")
+        cleaned_text = cached_clean["cleaned_text"]
+        removed_count = cached_clean["removed"]
+        audit_log = cached_clean["audit_log"]
+    else:
+        cleaned_text = text_cleaner.clean(raw_text)
+        removed_count = text_cleaner.removed_count
+        # The audit summary is only built when something was removed
+        audit_log = text_cleaner.get_audit_summary()["audit_log"] if removed_count > 0 else []
+        if extraction_cache:
+            extraction_cache.store_cleaned(clean_key, {"cleaned_text": cleaned_text, "removed": removed_count,
+                                                       "audit_log": audit_log})
+    
+    # Log cleaning audit
+    if removed_count > 0:
+        logger.log_cleaning_details(removed_items=audit_log, total_removed=removed_count)
 
     stats = text_cleaner.get_cleaning_stats(raw_text, cleaned_text)
+    del raw_text  # Only the cleaned text is needed from here on
     logger.log_extraction_summary(num_pages, stats["original_length"], num_tables, stats["cleaned_length"])
     FileHandler.save_text(cleaned_text, file_cleaned_dir / f"{pdf_file.stem}_cleaned.txt")
     
-    stage_duration = time.time() - stage_start
+    stage_duration = time.perf_counter() - stage_start
     reduction = ((stats["original_length"] - stats["cleaned_length"]) / stats["original_length"] * 100) if stats["original_length"] > 0 else 0
     logger.log_stage_end("Text Cleaning", stage_duration, f"Reduced from {stats['original_length']:,} to {stats['cleaned_length']:,} chars ({reduction:.0f}% removed)")
     
@@ -289,7 +420,7 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     # =========================================================================
     xlsx_text = ""
     if xlsx_files:
-        stage_start = time.time()
+        stage_start = time.perf_counter()
         logger.log_stage_start(
             stage_number=4,
             stage_name="XLSX Processing",
@@ -297,35 +428,187 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
         )
         for xlsx_file in xlsx_files:
             logger.debug(f"Processing XLSX file: {xlsx_file.name}")
-            xlsx_text += FileHandler.xlsx_to_text(xlsx_file)
-        stage_duration = time.time() - stage_start
+        # Read concurrently since stage 1 - wait for the rest and join once
+        xlsx_text = "".join(xlsx_results)
+        stage_duration = time.perf_counter() - stage_start
         logger.log_stage_end("XLSX Processing", stage_duration, f"Processed {len(xlsx_files)} XLSX file(s)")
     
-    tracker = TokenTracker(model=Config.DEFAULT_MODEL)
+    # Optionally cut long email text down to the paragraphs the fields depend on
+    llm_text = cleaned_text
+    if Config.CONTEXT_PRUNE_MAX_CHARS:
+        from src.utils.context_pruner import prune
+        llm_text = prune(cleaned_text, Config.CONTEXT_PRUNE_MAX_CHARS)
+        if len(llm_text) < len(cleaned_text):
+            logger.info(f"✂️  Pruned LLM text from {len(cleaned_text):,} to {len(llm_text):,} chars "
+                        f"(est. ~{len(cleaned_text) // 4:,} → ~{len(llm_text) // 4:,} tokens at 4 chars/token)")
     
-    # Prepare full context for LLM
-    full_context = f"{cleaned_text}\n\n=== EXTRACTED TABLES ===\n{table_text}\n\n=== EXTRACTED XLSX ===\n{xlsx_text}".strip()
+    # Prepare full context for LLM. It is kept as parts here: the file and log are written
+    # from them and the parent joins them once, so the worker never holds a combined copy
+    context_parts = build_full_context_parts(llm_text, table_text, xlsx_text)
     
     # Save full context to cleaned_data
-    FileHandler.save_text(full_context, file_cleaned_dir / f"{pdf_file.stem}_full_context.txt")
+    FileHandler.save_text_parts(context_parts, file_cleaned_dir / f"{pdf_file.stem}_full_context.txt")
     
     # Log full context to debug log
-    logger.log_llm_context(full_context)
+    logger.log_llm_context(context_parts)
+    
+    context = {
+        "status": "prepared", "pdf_file": pdf_file, "output_path": output_root,
+        "file_start": file_start, "num_pages": num_pages, "num_tables": num_tables,
+        "cleaned_text": llm_text, "table_text": table_text, "xlsx_text": xlsx_text,
+        # Deterministic overrides scan the unpruned text - their trigger phrases are not pruner keywords
+        "override_text": cleaned_text,
+        "pruned_chars": len(cleaned_text) - len(llm_text),
+        "full_context_parts": context_parts
+    }
     
     # Check if we should stop here (Context Only / Extract Only)
     if stop_early:
         logger.info("⏸️  Stopping early (extract-only or context-only mode)")
-        return {}, {
-            "tokens": 0, "cost": 0.0, "time": time.time() - file_start,
-            "status": "context_generated", "pdf_file": pdf_file.name,
-            "input_tokens": 0, "output_tokens": 0, "total_tokens": 0,
-            "processing_time_seconds": time.time() - file_start
-        }
+        context["status"] = "context_generated"
+    
+    return context
+
+
+def build_full_context_parts(cleaned_text: str, table_text: str, xlsx_text: str) -> list:
+    """
+    Split the LLM context (cleaned text + tables + XLSX) into parts whose concatenation
+    equals strip() on the whole. The outer parts are trimmed instead of the combined string,
+    so callers can write or hash the context without materializing it; untrimmed parts are
+    the original strings, which pickle shares with the rest of the context dict.
+    """
+    parts = [cleaned_text, "\n\n=== EXTRACTED TABLES ===\n", table_text, "\n\n=== EXTRACTED XLSX ===\n", xlsx_text]
+    
+    # Drop all-whitespace parts at either end, then trim the new outer parts
+    while parts and (not parts[0] or parts[0].isspace()):
+        parts.pop(0)
+    while parts and (not parts[-1] or parts[-1].isspace()):
+        parts.pop()
+    if not parts:
+        return []
+    parts[0] = parts[0].lstrip()
+    parts[-1] = parts[-1].rstrip()
+    return parts
+
+
+async def process_pdf_async(context: dict, semaphore: asyncio.Semaphore, rate_limiter: TokenBucketRateLimiter, llm_cache: LLMCache, tracker,
+                            model_params: dict):
+    """
+    Run the LLM extraction and output stages for a prepared PDF.
+    The LLM call is network-bound, so many of these run concurrently on one event loop;
+    the semaphore bounds in-flight requests and the rate limiter paces them to the provider's RPM/TPM limits.
+    Returns (result, file_metrics); failures are reported via file_metrics["status"].
+    """
+    import asyncio
+    from src.logger import create_logger
+    
+    pdf_file = context["pdf_file"]
+    file_output_path = context["output_path"]
+    
+    # Re-open this file's log (written by the worker during preparation)
+    logger = create_logger(file_output_path, console_enabled=True, append=True)
+    logger.log_model_params(model_params)
+    
+    try:
+        # The worker sends the context as parts - join it once, here
+        context["full_context"] = "".join(context.pop("full_context_parts"))
+        async with semaphore:
+            llm_output = await extract_pdf_fields_async(context, logger, rate_limiter, llm_cache)
+        # Output generation is blocking file/Excel I/O - keep it off the event loop
+        result, file_metrics = await asyncio.to_thread(generate_pdf_outputs, context, llm_output, logger, tracker)
+        logger.log_processing_complete(file_output_path / "final_output", file_metrics["processing_time_seconds"])
+        return result, file_metrics
+    
+    except Exception as e:
+        logger.error(f"Failed to process {pdf_file.name}: {str(e)}")
+        return None, {"file": pdf_file.name, "status": "failed", "error": str(e)}
+    
+    finally:
+        logger.close()
+
 
+async def run_batch(jobs: list, max_workers: int, llm_cache: LLMCache) -> dict:
+    """
+    Run every job through preparation and the LLM stage, overlapping the two:
+    workers keep preparing PDFs while earlier ones are already waiting on the LLM.
+    Returns {idx: (result, file_metrics)}.
+    """
+    import asyncio
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from src.logger import FieldLevelLogger
+    from src.utils.rate_limiter import TokenBucketRateLimiter
+    
+    loop = asyncio.get_running_loop()
+    
+    # Spawned workers: this process runs threads (log listeners, LLM client) while
+    # the pool starts workers on demand, and forking a threaded process is unsafe
+    if max_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(Config.DEFAULT_MODEL, Config.TEMPERATURE, Config.MAX_TOKENS)
+        )
+    else:
+        # Single worker: prepare in order on a background thread so the event loop stays free
+        executor = ThreadPoolExecutor(max_workers=1)
+    
+    # DSPy and the shared LLM-stage state are only set up if some PDF needs the LLM
+    llm_stage = None
+    
+    def get_llm_stage():
+        nonlocal llm_stage
+        if llm_stage is None:
+            try:
+                configure_dspy(FieldLevelLogger(console_enabled=True))
+                # One tracker for the whole batch (tiktoken encoding + pricing lookup are reused)
+                from src.utils.token_tracker import TokenTracker
+                llm_stage = {
+                    "semaphore": asyncio.Semaphore(Config.MAX_CONCURRENT_LLM),
+                    "rate_limiter": TokenBucketRateLimiter(Config.LLM_REQUESTS_PER_MINUTE, Config.LLM_TOKENS_PER_MINUTE),
+                    "tracker": TokenTracker(model=Config.DEFAULT_MODEL),
+                    # Model settings are fixed for the batch - build the dict logged per file once
+                    "model_params": Config.get_model_params()
+                }
+            except Exception as e:
+                llm_stage = {"error": str(e)}
+        return llm_stage
+    
+    async def run_job(job: dict):
+        try:
+            context = await loop.run_in_executor(executor, process_pdf_worker, job)
+        except Exception as e:
+            # Worker died before it could report (e.g. crashed process)
+            context = {"pdf_file": job["pdf_file"], "status": "failed", "error": str(e)}
+        
+        if context["status"] == "failed":
+            return None, {"file": context["pdf_file"].name, "status": "failed", "error": context["error"]}
+        if context["status"] == "context_generated":
+            return None, {"file": context["pdf_file"].name, "status": "context_generated"}
+        
+        stage = get_llm_stage()
+        if "error" in stage:
+            return None, {"file": context["pdf_file"].name, "status": "failed", "error": stage["error"]}
+        return await process_pdf_async(context, stage["semaphore"], stage["rate_limiter"], llm_cache, stage["tracker"],
+                                       stage["model_params"])
+    
+    with executor:
+        outcomes = await asyncio.gather(*(run_job(job) for job in jobs))
+    return {job["idx"]: outcome for job, outcome in zip(jobs, outcomes)}
+
+
+async def extract_pdf_fields_async(context: dict, logger, rate_limiter: TokenBucketRateLimiter, llm_cache: LLMCache):
+    """Stage 4: LLM field extraction for one prepared PDF (served from the response cache when possible)."""
+    cleaned_text = context["cleaned_text"]
+    override_text = context["override_text"]
+    table_text = context["table_text"]
+    xlsx_text = context["xlsx_text"]
+    
     # =========================================================================
     # STAGE 4/5: LLM FIELD EXTRACTION (DSPy Chain-of-Thought)
     # =========================================================================
-    stage_start = time.time()
+    stage_start = time.perf_counter()
     logger.log_stage_start(
         stage_number=4,
         stage_name="LLM Field Extraction",
@@ -334,24 +617,69 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     
     # Lazy import to avoid crash if dspy is broken and we only wanted context
     from src.dspy_modules.field_extractor import RetailerHubFieldExtractor
-    from src.utils.config_generator import ConfigGenerator
     
-    field_extractor = RetailerHubFieldExtractor(logger)
+    field_extractor = RetailerHubFieldExtractor(logger, rate_limiter=rate_limiter)
+    
+    # Identical context, model settings and DSPy program produce the same prediction - skip the LLM on a hit.
+    # Only the raw prediction is cached; overrides and validation always run on the current code.
+    cache_key = LLMCache.make_key(context["full_context"], Config.DEFAULT_MODEL, Config.TEMPERATURE, Config.MAX_TOKENS, Config.TOP_P,
+                                  RetailerHubFieldExtractor.program_fingerprint())
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"♻️  LLM cache hit ({cache_key[:12]}) - skipping LLM call")
+        token_stats = {"input_tokens": 0, "output_tokens": 0, "total_chars": 0, "cache_hit": True}
+        output_json, reasoning_json, actual_token_stats, full_fields = field_extractor.process_prediction(
+            cached["prediction"], override_text, token_stats)
+        logger.log_stage_end("LLM Field Extraction", time.perf_counter() - stage_start, f"Loaded {len(output_json)} fields from cache")
+        return output_json, reasoning_json, actual_token_stats, full_fields
+    if llm_cache.mode == "replay":
+        raise RuntimeError(f"LLM cache miss in replay mode (key {cache_key[:12]})")
     
     # Log input context being sent to LLM
     logger.log_input_context(cleaned_text, table_text, xlsx_text)
     
-    # Extract fields - returns 4 values: output (filtered), reasoning, tokens, full_fields (includes config_*)
-    output_json, reasoning_json, actual_token_stats, full_fields = field_extractor.extract_fields(cleaned_text, table_text, xlsx_text)
+    # Call the LLM, cache its raw prediction, then post-process - returns output (filtered), reasoning,
+    # tokens and full_fields (includes config_*)
+    prediction, token_stats = await field_extractor.predict_async(cleaned_text, table_text, xlsx_text)
+    llm_cache.put(cache_key, {"prediction": prediction})
+    output_json, reasoning_json, actual_token_stats, full_fields = field_extractor.process_prediction(
+        prediction, override_text, token_stats)
     
-    stage_duration = time.time() - stage_start
+    stage_duration = time.perf_counter() - stage_start
     fields_extracted = len(output_json)
     logger.log_stage_end("LLM Field Extraction", stage_duration, f"Extracted {fields_extracted} fields from content")
     
+    return output_json, reasoning_json, actual_token_stats, full_fields
+
+
+def generate_pdf_outputs(context: dict, llm_output: tuple, logger, tracker):
+    """Stage 5: enrich the LLM fields, write the per-file outputs and compute metrics."""
+    pdf_file = context["pdf_file"]
+    output_root = context["output_path"]
+    file_start = context["file_start"]
+    num_pages = context["num_pages"]
+    num_tables = context["num_tables"]
+    full_context = context["full_context"]
+    output_json, reasoning_json, actual_token_stats, full_fields = llm_output
+    
+    from src.utils.config_generator import ConfigGenerator
+    from src.utils.mapping_manager import MappingManager
+    
+    file_extracted_dir = output_root / "extracted_text"
+    final_root = output_root / "final_output"
+    final_root.mkdir(parents=True, exist_ok=True)
+    
+    # Initialize Mapping Manager
+    mapping_manager = MappingManager(
+        fsn_mapping_path="mapping/FSN Model mapping.xlsx.ods",
+        ls_mapping_path="mapping/DMRP data_Lifestyle 24-25.ods",
+        logger=logger
+    )
+    
     # =========================================================================
     # STAGE 5: OUTPUT GENERATION & ENRICHMENT
     # =========================================================================
-    stage_start = time.time()
+    stage_start = time.perf_counter()
     logger.log_stage_start(
         stage_number=5,
         stage_name="Output Generation & Mapping",
@@ -388,6 +716,8 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
         periods = [{"start_date": full_fields.get("start_date"), "end_date": full_fields.get("end_date")}]
 
     # 4. Generate Config Files (One per Period)
+    # Output files are collected and written together at the end of the stage
+    pending_writes = []
     config_paths = []
     for i, period in enumerate(periods):
         period_fields = full_fields.copy()
@@ -398,7 +728,7 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
         
         suffix = f"_P{i+1}" if len(periods) > 1 else ""
         period_config_path = final_root / f"{pdf_file.stem}_config{suffix}.json"
-        FileHandler.save_json(json.dumps(config_json, indent=2, ensure_ascii=False), period_config_path)
+        pending_writes.append((config_json, period_config_path))
         config_paths.append(period_config_path)
         
     logger.debug(f"Generated {len(config_paths)} configuration file(s)")
@@ -407,27 +737,36 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     final_json_path = final_root / f"{pdf_file.stem}_output.json"
     # Update output_json with resolved FSNs for visibility
     output_json["resolved_fsns"] = resolved_fsns
-    FileHandler.save_json(json.dumps(output_json, indent=2, ensure_ascii=False), final_json_path)
+    pending_writes.append((output_json, final_json_path))
     
     # Save Reasoning JSON
     reasoning_json_path = final_root / f"{pdf_file.stem}_reasoning.json"
-    FileHandler.save_json(json.dumps(reasoning_json, indent=2, ensure_ascii=False), reasoning_json_path)
+    pending_writes.append((reasoning_json, reasoning_json_path))
+    FileHandler.save_json_many(pending_writes)
     
-    stage_duration = time.time() - stage_start
+    stage_duration = time.perf_counter() - stage_start
     logger.log_stage_end("Output Generation", stage_duration, f"Created {len(config_paths) + 2} output files in {final_root.name}/")
     
     # Log token usage and cost
-    if actual_token_stats.get("input_tokens", 0) > 0:
+    if actual_token_stats.get("cache_hit"):
+        # Served from the response cache - no tokens were billed
+        input_tokens = output_tokens = total_tokens = cached_tokens = 0
+        cost = 0.0
+    elif actual_token_stats.get("input_tokens", 0) > 0:
         input_tokens = actual_token_stats["input_tokens"]
         output_tokens = actual_token_stats["output_tokens"]
+        cached_tokens = actual_token_stats.get("cached_tokens", 0)
         total_tokens = input_tokens + output_tokens
-        cost = tracker.calculate_cost(input_tokens, output_tokens)
+        cost = tracker.calculate_cost(input_tokens, output_tokens, cached_tokens)
+        if cached_tokens:
+            logger.info(f"💾 {cached_tokens:,} input tokens served from the provider's prompt cache")
     else:
         # Fallback to estimate
         usage_stats = tracker.track_usage(full_context, json.dumps(output_json))
         input_tokens = usage_stats["input_tokens"]
         output_tokens = usage_stats["output_tokens"]
         total_tokens = usage_stats["total_tokens"]
+        cached_tokens = 0
         cost = usage_stats["cost"]
     
     logger.log_token_usage(input_tokens, output_tokens, total_tokens, tracker.model, cost)
@@ -437,8 +776,9 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     
     file_metrics = {
         "file": pdf_file.name, "status": "success", "pages": num_pages, "tables_extracted": num_tables,
-        "input_tokens": input_tokens, "output_tokens": output_tokens,
-        "total_tokens": total_tokens, "cost": cost,
+        "input_tokens": input_tokens, "output_tokens": output_tokens, "cached_tokens": cached_tokens,
+        "total_tokens": total_tokens, "cost": cost, "llm_cache_hit": bool(actual_token_stats.get("cache_hit")),
+        "context_chars_pruned": context["pruned_chars"],
         "processing_time_seconds": round(time.time() - file_start, 2),
         "output_directory": str(file_extracted_dir.parent.name)  # Relative to output root
     }
@@ -452,8 +792,8 @@ def process_pdf(pdf_file: Path, output_root: Path, xlsx_files: list, logger, fil
     return result, file_metrics
 
 
-def save_consolidated_output(output_path: Path, results: list, metrics: dict):
-    """Save consolidated output with all results and LLM metrics."""
+def save_consolidated_output(output_path: Path, results: list, metrics: dict, timestamp: str):
+    """Save consolidated output with all results and LLM metrics (file names carry the run's timestamp)."""
     consolidated = {
         "summary": {
             "total_files": metrics["total_pdfs"], "successful": metrics["successful"], 
@@ -463,6 +803,7 @@ def save_consolidated_output(output_path: Path, results: list, metrics: dict):
         "llm_metrics": {
             "total_input_tokens": metrics["total_input_tokens"],
             "total_output_tokens": metrics["total_output_tokens"],
+            "total_cached_tokens": metrics["total_cached_tokens"],
             "total_tokens": metrics["total_tokens"],
             "total_cost_usd": round(metrics["total_cost"], 4),
             "average_tokens_per_file": round(metrics["total_tokens"] / max(metrics["successful"], 1), 2),
@@ -474,13 +815,13 @@ def save_consolidated_output(output_path: Path, results: list, metrics: dict):
     
     # Save consolidated output (creates a summary folder automatically via FileHandler if needed, but we pass path)
     # Just save directly to the output root provided
-    FileHandler.save_json(json.dumps(consolidated, indent=2, ensure_ascii=False), 
-                         output_path / f"batch_summary_{time.strftime('%d%m%Y%H%M')}.json")
+    FileHandler.save_json_stream(consolidated, output_path / f"batch_summary_{timestamp}.json")
     
     # Save metrics-only file
     metrics_only = {"summary": consolidated["summary"], "llm_metrics": consolidated["llm_metrics"],
                     "per_file_metrics": consolidated["per_file_metrics"]}
-    FileHandler.save_json(json.dumps(metrics_only, indent=2), output_path / f"batch_metrics_{time.strftime('%d%m%Y%H%M')}.json")
+    # Metrics file is machine-read - write it compact
+    FileHandler.save_json_stream(metrics_only, output_path / f"batch_metrics_{timestamp}.json", compact=True)
 
 
 def print_summary(metrics: dict):
@@ -495,6 +836,8 @@ def print_summary(metrics: dict):
     print(f"  Total Tokens:     {metrics['total_tokens']:,}")
     print(f"  Input Tokens:     {metrics['total_input_tokens']:,}")
     print(f"  Output Tokens:    {metrics['total_output_tokens']:,}")
+    if metrics['total_cached_tokens']:
+        print(f"  Cached Tokens:    {metrics['total_cached_tokens']:,}")
     print(f"  {Fore.GREEN}Total Cost:       ${metrics['total_cost']:.4f}{Style.RESET_ALL}")
     if metrics['successful'] > 0:
         print(f"  Avg Cost/File:    ${metrics['total_cost'] / metrics['successful']:.4f}")
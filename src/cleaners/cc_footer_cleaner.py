@@ -5,6 +5,15 @@ Takes full text, removes Cc blocks and footers, returns cleaned text.
 import re
 from typing import Dict
 
+from ..logger import debug_enabled
+from .pattern_utils import combine_patterns
+
+# Patterns used on every line/paragraph - compiled once at import
+EMAIL_RE = re.compile(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', re.IGNORECASE)
+CC_LINE_RE = re.compile(r'(?i)^Cc\s*:')
+METADATA_LINE_RE = re.compile(r'(?i)^\s*(From|To|Cc|Sent|Subject|Date)\s*:')
+PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+
 
 class CcFooterCleaner:
     """Pipeline cleaner for Cc blocks, headers, and footer links."""
@@ -28,10 +37,14 @@ class CcFooterCleaner:
         r'(?i)manage preferences',
     ]
     
+    _header_re = combine_patterns(HEADER_PATTERNS)
+    _footer_re = combine_patterns(FOOTER_PATTERNS)
+    # Thread-start markers (high-confidence header signal)
+    _thread_marker_re = combine_patterns([p for p in HEADER_PATTERNS if "wrote" in p or "Forwarded" in p])
+    
     def __init__(self, logger=None):
         self.logger = logger
-        self._compiled_headers = [re.compile(p) for p in self.HEADER_PATTERNS]
-        self._compiled_footers = [re.compile(p) for p in self.FOOTER_PATTERNS]
+        self._debug = debug_enabled(logger)
         self.stats = {
             "cc_blocks_removed": 0,
             "headers_removed": 0,
@@ -70,20 +83,21 @@ class CcFooterCleaner:
             line_stripped = line.strip()
             
             # Detect start of Cc block
-            if re.match(r'(?i)^Cc\s*:', line_stripped):
+            if CC_LINE_RE.match(line_stripped):
                 skip_cc_block = True
                 self.stats["cc_blocks_removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Cc Line] Removed: {line_stripped[:50]}...")
                 continue
             
             # Check if we're in a Cc block continuation
             if skip_cc_block:
-                has_email = bool(re.search(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', line_stripped, re.IGNORECASE))
+                # Every address contains '@' - the substring test skips the regex on most lines
+                has_email = '@' in line_stripped and EMAIL_RE.search(line_stripped) is not None
                 ends_with_separator = line_stripped.endswith((',', ';'))
                 
                 if has_email or ends_with_separator:
-                    if self.logger:
+                    if self._debug:
                         self.logger.debug(f"[Cc Continuation] Removed: {line_stripped[:50]}...")
                     continue
                 else:
@@ -96,7 +110,7 @@ class CcFooterCleaner:
     def _remove_headers_footers(self, text: str) -> str:
         """Remove email headers and footer links from paragraphs."""
         # Segment into paragraphs
-        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+        paragraphs = [p.strip() for p in PARAGRAPH_SPLIT_RE.split(text) if p.strip()]
         
         cleaned_paragraphs = []
         
@@ -105,7 +119,7 @@ class CcFooterCleaner:
             if self._is_header(para):
                 self.stats["headers_removed"] += 1
                 self.stats["paragraphs_removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Header] Removed: {para[:50]}...")
                 continue
             
@@ -113,7 +127,7 @@ class CcFooterCleaner:
             if self._is_footer(para):
                 self.stats["footers_removed"] += 1
                 self.stats["paragraphs_removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Footer] Removed: {para[:50]}...")
                 continue
             
@@ -124,17 +138,23 @@ class CcFooterCleaner:
     
     def _is_header(self, text: str) -> bool:
         """Detect email header blocks."""
+        # Every header signal needs a ':' or an address, except the "Forwarded message" banner -
+        # body paragraphs without any of them are rejected before splitting or running a regex
+        if ':' not in text and '@' not in text and 'forwarded' not in text.lower():
+            return False
+        
         lines = [l.strip() for l in text.split('\n') if l.strip()]
         if not lines:
             return False
         
         # High confidence: Thread start markers
-        if any(p.search(text) for p in self._compiled_headers if "wrote" in p.pattern or "Forwarded" in p.pattern):
+        if self._thread_marker_re.search(text):
             return True
         
         # Check for standard email metadata
-        has_metadata = any(re.search(r'(?i)^\s*(From|To|Cc|Sent|Subject|Date)\s*:', line) for line in lines)
-        header_lines = sum(1 for line in lines if any(p.search(line) for p in self._compiled_headers))
+        # Metadata lines always contain ':' - only those reach the regex
+        has_metadata = any(':' in line and METADATA_LINE_RE.search(line) for line in lines)
+        header_lines = sum(1 for line in lines if self._header_re.search(line))
         
         if len(lines) == 1:
             return header_lines == 1
@@ -142,7 +162,7 @@ class CcFooterCleaner:
     
     def _is_footer(self, text: str) -> bool:
         """Detect footer links and pagination."""
-        return any(p.search(text) for p in self._compiled_footers)
+        return self._footer_re.search(text) is not None
     
     def get_stats(self) -> Dict:
         """Return cleaning statistics."""
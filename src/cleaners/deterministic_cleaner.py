@@ -2,12 +2,56 @@
 Deterministic Content Cleaner - Lean Pipeline with Protection
 Chains specialized cleaners while preserving business data and tables.
 """
+import hashlib
 import re
+import sys
 import unicodedata
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict
 
+from ..logger import debug_enabled
+from . import cc_footer_cleaner, disclaimer_cleaner, pattern_utils
 from .cc_footer_cleaner import CcFooterCleaner
-from .disclaimer_cleaner import DisclaimerCleaner
+from .disclaimer_cleaner import DisclaimerCleaner, remove_disclaimer_blocks
+from .pattern_utils import combine_patterns
+
+# Patterns used on every line/paragraph - compiled once at import
+EMAIL_RE = re.compile(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', re.IGNORECASE)
+CC_LINE_RE = re.compile(r'(?i)^Cc\s*:')
+FROM_TO_HEADER_RE = re.compile(r'(?i)^(From|To)\s*:', re.IGNORECASE)
+PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+ALIGNED_COLUMNS_RE = re.compile(r'\w{2,}\s{3,}\w{2,}')
+# Three whitespace characters within one line - needed by any ALIGNED_COLUMNS_RE line match
+WHITESPACE_RUN_RE = re.compile(r'[^\S\n]{3}')
+# Disclaimer block boundaries for the pre-segmentation sweep (a wider set than DisclaimerCleaner's)
+DISCLAIMER_START_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'This e-mail message may contain confidential',
+    r'This email.*?confidential.*?legally protected',
+    r'This email and any files transmitted.*?confidential',
+    r'This message contains confidential information',
+    r'Any views or opinions presented in this email',
+    r'(?i)本电子邮件及其附件含有.*?保密信息',
+)]
+DISCLAIMER_END_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'confirmation of any transaction or contract',
+    r'attachments are not intended as an offer',
+    r'strictly prohibited',
+    r'personally liable for any damages',
+    r'actions taken on the basis of the information provided',
+)]
+# First characters of a Cc:/From:/To: header line - other lines skip both header regexes
+HEADER_INITIALS = 'cCfFtT'
+
+# Post-NFKC character fixes, applied in a single str.translate pass
+NORMALIZE_TABLE = {
+    **dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]),  # control chars
+    **dict.fromkeys([0x200B, 0x200C, 0x200D, 0xFEFF]),  # invisible chars
+    0x00AD: None,  # soft hyphen
+    0x2028: '\n', 0x2029: '\n',  # standardize line breaks
+    0x00A0: ' ',  # space normalization
+    0x2011: '-',  # hyphen normalization
+}
 
 
 class DeterministicContentCleaner:
@@ -75,11 +119,13 @@ class DeterministicContentCleaner:
         r'\b[A-Z]{2,4}-\d{3,}',
     ]
     
+    _protected_re = combine_patterns(PROTECTED_KEYWORDS)
+    
     def __init__(self, logger=None):
         self.logger = logger
+        self._debug = debug_enabled(logger)
         self.cc_footer_cleaner = CcFooterCleaner(logger=logger)
         self.disclaimer_cleaner = DisclaimerCleaner(logger=logger)
-        self._compiled_protected = [re.compile(p) for p in self.PROTECTED_KEYWORDS]
         
         # Statistics
         self.audit_summary = {
@@ -90,6 +136,15 @@ class DeterministicContentCleaner:
             "table_count": 0
         }
     
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def rules_fingerprint() -> str:
+        """Hash of the cleaner sources; it changes whenever a cleaning rule does (used as a cache key)."""
+        digest = hashlib.sha256()
+        for module in (sys.modules[__name__], cc_footer_cleaner, disclaimer_cleaner, pattern_utils):
+            digest.update(Path(module.__file__).read_bytes())
+        return digest.hexdigest()
+    
     def clean(self, text: str) -> str:
         """
         Main cleaning pipeline.
@@ -103,8 +158,7 @@ class DeterministicContentCleaner:
         text = self._normalize_text(text)
         
         # Step 2: Preprocess (before segmentation)
-        text = self._preprocess_cc_removal(text)
-        text = self._preprocess_from_to_removal(text)
+        text = self._preprocess_header_removal(text)
         text = self._preprocess_disclaimer_removal(text)
         
         # Step 3: Segment
@@ -112,35 +166,50 @@ class DeterministicContentCleaner:
         if not paragraphs:
             return ""
         
-        # Step 4: Classify paragraphs
+        # Steps 4-5: Classify paragraphs and clean the non-protected ones in the same pass
         protected_paragraphs = []
-        cleanable_paragraphs = []
+        cleaned_paragraphs = []
+        # Quoted reply chains repeat paragraphs verbatim - run the checks once per distinct text
+        verdicts = {}
         
         for para in paragraphs:
-            if self._is_table(para):
+            verdict = verdicts.get(para)
+            if verdict is None:
+                verdict = verdicts[para] = self._classify_paragraph(para)
+            
+            if verdict == "table":
                 protected_paragraphs.append(para)
                 self.audit_summary["table_count"] += 1
                 self.audit_summary["retained"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Table] Protected: {para[:50]}...")
-            elif self._is_protected(para):
+            elif verdict == "protected":
                 protected_paragraphs.append(para)
                 self.audit_summary["protected_count"] += 1
                 self.audit_summary["retained"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Protected] Kept: {para[:50]}...")
+            elif verdict == "header":
+                self.audit_summary["removed"] += 1
+                if self._debug:
+                    self.logger.debug(f"[Header] Removed: {para[:50]}...")
+            elif verdict == "footer":
+                self.audit_summary["removed"] += 1
+                if self._debug:
+                    self.logger.debug(f"[Footer] Removed: {para[:50]}...")
             else:
-                cleanable_paragraphs.append(para)
-        
-        # Step 5: Clean non-protected paragraphs
-        cleanable_text = '\n\n'.join(cleanable_paragraphs)
-        cleanable_text = self._clean_with_cc_footer(cleanable_text)
-        cleanable_text = self._clean_with_disclaimer(cleanable_text)
+                self.audit_summary["retained"] += 1
+                # Not memoized: a density hit also records an entry in the keyword report
+                if self.disclaimer_cleaner._is_disclaimer(para):
+                    self.audit_summary["removed"] += 1
+                    if self._debug:
+                        self.logger.debug(f"[Disclaimer] Removed: {para[:50]}...")
+                else:
+                    cleaned_paragraphs.append(para)
         
         # Step 6: Combine
         final_paragraphs = protected_paragraphs
-        if cleanable_text.strip():
-            final_paragraphs.extend(cleanable_text.split('\n\n'))
+        final_paragraphs.extend(cleaned_paragraphs)
         
         self._aggregate_stats()
         return '\n\n'.join(final_paragraphs)
@@ -148,70 +217,51 @@ class DeterministicContentCleaner:
     def _normalize_text(self, text: str) -> str:
         """Normalize Unicode and remove OCR artifacts."""
         text = unicodedata.normalize('NFKC', text)
-        text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text) #stripping control chars
-        text = re.sub(r'[\u200B-\u200D\uFEFF]', '', text) #Invisible char removal
-        text = re.sub(r'\u00AD', '', text) #hyphenation
-        text = re.sub(r'[\u2028\u2029]', '\n', text) #standardize line breaks
-        text = text.replace('\u00A0', ' ') #Space normalization
-        text = text.replace('\u2011', '-') #Hyphen normalization
-        return text
+        return text.translate(NORMALIZE_TABLE)
     
-    def _preprocess_cc_removal(self, text: str) -> str:
-        """Remove Cc: lines before segmentation."""
+    def _preprocess_header_removal(self, text: str) -> str:
+        """
+        Remove Cc: lines and From:/To: address headers before segmentation.
+        Both are handled in one pass over the lines: a line kept by the Cc check
+        goes straight on to the From/To check. Handles cases like:
+        From: Name <email@domain.com>
+        To: Recipient 1 <r1@domain.com>,
+            Recipient 2 <r2@domain.com>
+        """
         lines = text.split('\n')
         cleaned_lines = []
         skip_cc_block = False
+        skip_block = False
         
         for line in lines:
             line_stripped = line.strip()
+            maybe_header = line_stripped[:1] in HEADER_INITIALS
             
-            if re.match(r'(?i)^Cc\s*:', line_stripped):
+            # Cc: lines and their continuation lines
+            if maybe_header and CC_LINE_RE.match(line_stripped):
                 skip_cc_block = True
                 self.audit_summary["removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Cc] Removed: {line_stripped[:50]}...")
                 continue
             
             if skip_cc_block:
-                has_email = bool(re.search(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', line_stripped, re.IGNORECASE))
+                # Every address contains '@' - the substring test skips the regex on most lines
+                has_email = '@' in line_stripped and EMAIL_RE.search(line_stripped) is not None
                 ends_with_separator = line_stripped.endswith((',', ';'))
                 
                 if has_email or ends_with_separator:
-                    if self.logger:
+                    if self._debug:
                         self.logger.debug(f"[Cc Cont] Removed: {line_stripped[:50]}...")
                     continue
                 else:
                     skip_cc_block = False
             
-            cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
-    
-    def _preprocess_from_to_removal(self, text: str) -> str:
-        """
-        Safely removes From: and To: address headers, including multi-line lists.
-        Handles cases like:
-        From: Name <email@domain.com>
-        To: Recipient 1 <r1@domain.com>,
-            Recipient 2 <r2@domain.com>
-        """
-        lines = text.split('\n')
-        cleaned_lines = []
-        skip_block = False
-        
-        # Pattern to match start of header
-        header_pattern = re.compile(r'(?i)^(From|To)\s*:', re.IGNORECASE)
-        # Pattern to identify continuation (emails or comma-separated names)
-        email_pattern = re.compile(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', re.IGNORECASE)
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
             # Detect start of an address header
-            if header_pattern.match(line_stripped):
+            if maybe_header and FROM_TO_HEADER_RE.match(line_stripped):
                 skip_block = True
                 self.audit_summary["removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Address] Removing header: {line_stripped[:50]}...")
                 continue
             
@@ -222,11 +272,11 @@ class DeterministicContentCleaner:
                     skip_block = False
                 else:
                     # Check if this line is a continuation of the address list
-                    has_email = bool(email_pattern.search(line_stripped))
+                    has_email = '@' in line_stripped and EMAIL_RE.search(line_stripped) is not None
                     is_list_continuation = line_stripped.endswith((',', ';')) or '<' in line_stripped or '>' in line_stripped
                     
                     if has_email or is_list_continuation:
-                        if self.logger:
+                        if self._debug:
                             self.logger.debug(f"[Address Cont] Removing continuation: {line_stripped[:30]}...")
                         # Not incrementing 'removed' count for every line to avoid skewing stats, 
                         # usually the header block counts as one removal event.
@@ -241,62 +291,23 @@ class DeterministicContentCleaner:
     
     def _preprocess_disclaimer_removal(self, text: str) -> str:
         """Remove disclaimer blocks before segmentation."""
-        disclaimer_markers = [
-            r'This e-mail message may contain confidential',
-            r'This email.*?confidential.*?legally protected',
-            r'This email and any files transmitted.*?confidential',
-            r'This message contains confidential information',
-            r'Any views or opinions presented in this email',
-            r'(?i)本电子邮件及其附件含有.*?保密信息',
-        ]
-        
-        end_markers = [
-            r'confirmation of any transaction or contract',
-            r'attachments are not intended as an offer',
-            r'strictly prohibited',
-            r'personally liable for any damages',
-            r'actions taken on the basis of the information provided',
-        ]
-        
-        iteration = 0
-        while iteration < 10:
-            found = False
-            
-            for marker in disclaimer_markers:
-                match = re.search(marker, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    found = True
-                    start_pos = match.start()
-                    end_pos = len(text)
-                    
-                    for end_marker in end_markers:
-                        end_match = re.search(end_marker, text[start_pos:], re.IGNORECASE)
-                        if end_match:
-                            end_pos = start_pos + end_match.end()
-                            sentence_end = re.search(r'[.\n]', text[end_pos:end_pos+200])
-                            if sentence_end:
-                                end_pos += sentence_end.end()
-                            break
-                    
-                    if end_pos > start_pos:
-                        if self.logger:
-                            self.logger.debug(f"[Disclaimer] Removed {end_pos - start_pos} chars")
-                        self.audit_summary["removed"] += 1
-                        text = text[:start_pos] + text[end_pos:]
-                        break
-            
-            if not found:
-                break
-            iteration += 1
-        
+        text, removed = remove_disclaimer_blocks(text, DISCLAIMER_START_RES, DISCLAIMER_END_RES)
+        for size in removed:
+            if self._debug:
+                self.logger.debug(f"[Disclaimer] Removed {size} chars")
+            self.audit_summary["removed"] += 1
         return text
     
     def _segment_paragraphs(self, text: str) -> list:
         """Segment text into paragraphs."""
-        return [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+        return [p.strip() for p in PARAGRAPH_SPLIT_RE.split(text) if p.strip()]
     
     def _is_table(self, text: str) -> bool:
         """Detect if paragraph is a table."""
+        # Most paragraphs have no pipe, tab or column gap at all; skip the per-line checks
+        if '|' not in text and '\t' not in text and WHITESPACE_RUN_RE.search(text) is None:
+            return False
+        
         lines = [l.strip() for l in text.split('\n') if l.strip()]
         if not lines:
             return False
@@ -308,55 +319,31 @@ class DeterministicContentCleaner:
             return True
         
         # Aligned whitespace tables
-        alignment_lines = sum(1 for line in lines if re.search(r'\w{2,}\s{3,}\w{2,}', line) or '\t' in line)
+        alignment_lines = sum(1 for line in lines if ALIGNED_COLUMNS_RE.search(line) or '\t' in line)
         return len(lines) > 1 and (alignment_lines / len(lines)) >= 0.5
     
     def _is_protected(self, text: str) -> bool:
         """Check for business-critical keywords."""
-        text_no_emails = re.sub(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', '', text, flags=re.IGNORECASE)
-        return any(p.search(text_no_emails) for p in self._compiled_protected)
+        text_no_emails = EMAIL_RE.sub('', text) if '@' in text else text
+        return self._protected_re.search(text_no_emails) is not None
     
-    def _clean_with_cc_footer(self, text: str) -> str:
-        """Apply Cc/Footer cleaner to cleanable paragraphs."""
-        if not text.strip():
-            return text
-        
-        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
-        cleaned = []
-        
-        for para in paragraphs:
-            if self.cc_footer_cleaner._is_header(para):
-                self.audit_summary["removed"] += 1
-                if self.logger:
-                    self.logger.debug(f"[Header] Removed: {para[:50]}...")
-            elif self.cc_footer_cleaner._is_footer(para):
-                self.audit_summary["removed"] += 1
-                if self.logger:
-                    self.logger.debug(f"[Footer] Removed: {para[:50]}...")
-            else:
-                cleaned.append(para)
-                self.audit_summary["retained"] += 1
-        
-        return '\n\n'.join(cleaned)
-    
-    def _clean_with_disclaimer(self, text: str) -> str:
-        """Apply Disclaimer cleaner to cleanable paragraphs."""
-        if not text.strip():
-            return text
-        
-        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
-        cleaned = []
-        
-        for para in paragraphs:
-            if self.disclaimer_cleaner._is_disclaimer(para):
-                self.audit_summary["removed"] += 1
-                if self.logger:
-                    self.logger.debug(f"[Disclaimer] Removed: {para[:50]}...")
-            else:
-                cleaned.append(para)
-                
+    def _classify_paragraph(self, para: str) -> str:
+        """
+        Run the side-effect-free paragraph checks in pipeline order.
         
-        return '\n\n'.join(cleaned)
+        Returns:
+            "table", "protected", "header", "footer", or "body" for a paragraph
+            that still goes through the disclaimer check
+        """
+        if self._is_table(para):
+            return "table"
+        if self._is_protected(para):
+            return "protected"
+        if self.cc_footer_cleaner._is_header(para):
+            return "header"
+        if self.cc_footer_cleaner._is_footer(para):
+            return "footer"
+        return "body"
     
     def _aggregate_stats(self):
         """Aggregate statistics from cleaners."""
@@ -364,6 +351,11 @@ class DeterministicContentCleaner:
         disclaimer_stats = self.disclaimer_cleaner.get_stats()
         self.audit_summary["removed"] += cc_stats["paragraphs_removed"] + disclaimer_stats["paragraphs_removed"]
     
+    @property
+    def removed_count(self) -> int:
+        """Number of removal events so far (maintained incrementally during clean())."""
+        return self.audit_summary["removed"]
+    
     def get_cleaning_stats(self, original: str, cleaned: str) -> Dict:
         """Calculate cleaning statistics."""
         orig_len = len(original) if original else 0
@@ -3,7 +3,97 @@ Disclaimer Cleaner - Refactored for Pipeline Pattern
 Takes full text, removes disclaimers, returns cleaned text.
 """
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from ..logger import debug_enabled
+from .pattern_utils import combine_patterns
+
+PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+SENTENCE_END_RE = re.compile(r'[.\n]')
+REGEX_METACHARACTERS = frozenset('\\.^$*+?{}[]|()')
+
+
+@lru_cache(maxsize=None)
+def _marker_probe(marker_re: re.Pattern) -> Optional[re.Pattern]:
+    """
+    Pattern for the literal tail of a 'head.*?tail' marker, which every match contains.
+
+    Searching for the tail alone is linear, while the marker itself retries every
+    head/middle pair when the tail is missing from the text.
+
+    Args:
+        marker_re: Compiled start marker
+
+    Returns:
+        Compiled tail literal (with the marker's case sensitivity), or None if the
+        marker has no literal tail
+    """
+    if '.*?' not in marker_re.pattern:
+        return None
+    tail = marker_re.pattern.rsplit('.*?', 1)[1]
+    if not tail or any(ch in REGEX_METACHARACTERS for ch in tail):
+        return None
+    return re.compile(re.escape(tail), marker_re.flags & re.IGNORECASE)
+
+
+def remove_disclaimer_blocks(text: str, marker_res: List[re.Pattern], ending_res: List[re.Pattern],
+                             max_blocks: int = 10) -> Tuple[str, List[int]]:
+    """
+    Cut disclaimer blocks out of unsegmented text, one block per pass.
+
+    Each pass removes the block opened by the first start marker (in list order)
+    found in the text, up to the first end marker after it plus the rest of that
+    sentence, or to the end of the text when no end marker follows.
+
+    Args:
+        text: Full text
+        marker_res: Compiled start markers in priority order
+        ending_res: Compiled end markers in priority order
+        max_blocks: Maximum number of passes
+
+    Returns:
+        Tuple of (text without the blocks, length of each removed block)
+    """
+    removed = []
+    iteration = 0
+    
+    while iteration < max_blocks:
+        found_disclaimer = False
+        
+        for marker_re in marker_res:
+            probe = _marker_probe(marker_re)
+            if probe is not None and probe.search(text) is None:
+                continue
+            match = marker_re.search(text)
+            if match:
+                found_disclaimer = True
+                start_pos = match.start()
+                
+                # Find the end (searched in place rather than on a copy of the tail)
+                end_pos = len(text)
+                for end_re in ending_res:
+                    end_match = end_re.search(text, start_pos)
+                    if end_match:
+                        end_pos = end_match.end()
+                        # Find sentence end
+                        sentence_end = SENTENCE_END_RE.search(text, end_pos, end_pos + 200)
+                        if sentence_end:
+                            end_pos = sentence_end.end()
+                        break
+                
+                # Remove block
+                if end_pos > start_pos:
+                    removed.append(end_pos - start_pos)
+                    text = text[:start_pos] + text[end_pos:]
+                    break
+        
+        if not found_disclaimer:
+            break
+        
+        iteration += 1
+    
+    return text, removed
 
 
 class DisclaimerCleaner:
@@ -53,9 +143,13 @@ class DisclaimerCleaner:
     
     DENSITY_THRESHOLD = 3  # Min keywords to classify as disclaimer
     
+    _boilerplate_re = combine_patterns(BOILERPLATE_PATTERNS)
+    _marker_res = [re.compile(marker, re.IGNORECASE | re.DOTALL) for marker in DISCLAIMER_MARKERS]
+    _ending_res = [re.compile(ending, re.IGNORECASE) for ending in DISCLAIMER_ENDINGS]
+    
     def __init__(self, logger=None):
         self.logger = logger
-        self._compiled_patterns = [re.compile(p) for p in self.BOILERPLATE_PATTERNS]
+        self._debug = debug_enabled(logger)
         self.stats = {
             "disclaimers_removed": 0,
             "disclaimer_blocks_removed": 0,
@@ -86,49 +180,16 @@ class DisclaimerCleaner:
     
     def _remove_disclaimer_blocks(self, text: str) -> str:
         """Remove large disclaimer blocks before segmentation."""
-        max_iterations = 10
-        iteration = 0
-        
-        while iteration < max_iterations:
-            found_disclaimer = False
-            
-            for marker in self.DISCLAIMER_MARKERS:
-                match = re.search(marker, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    found_disclaimer = True
-                    start_pos = match.start()
-                    
-                    # Find the end
-                    end_pos = len(text)
-                    for end_marker in self.DISCLAIMER_ENDINGS:
-                        end_match = re.search(end_marker, text[start_pos:], re.IGNORECASE)
-                        if end_match:
-                            end_pos = start_pos + end_match.end()
-                            # Find sentence end
-                            remainder = text[end_pos:end_pos+200]
-                            sentence_end = re.search(r'[.\n]', remainder)
-                            if sentence_end:
-                                end_pos += sentence_end.end()
-                            break
-                    
-                    # Remove block
-                    if end_pos > start_pos:
-                        if self.logger:
-                            self.logger.debug(f"[Disclaimer Block] Removed {end_pos - start_pos} chars")
-                        self.stats["disclaimer_blocks_removed"] += 1
-                        text = text[:start_pos] + text[end_pos:]
-                        break
-            
-            if not found_disclaimer:
-                break
-            
-            iteration += 1
-        
+        text, removed = remove_disclaimer_blocks(text, self._marker_res, self._ending_res)
+        for size in removed:
+            if self._debug:
+                self.logger.debug(f"[Disclaimer Block] Removed {size} chars")
+            self.stats["disclaimer_blocks_removed"] += 1
         return text
     
     def _remove_disclaimer_paragraphs(self, text: str) -> str:
         """Remove disclaimer paragraphs using density analysis."""
-        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+        paragraphs = [p.strip() for p in PARAGRAPH_SPLIT_RE.split(text) if p.strip()]
         
         cleaned_paragraphs = []
         
@@ -136,7 +197,7 @@ class DisclaimerCleaner:
             if self._is_disclaimer(para):
                 self.stats["disclaimers_removed"] += 1
                 self.stats["paragraphs_removed"] += 1
-                if self.logger:
+                if self._debug:
                     self.logger.debug(f"[Disclaimer] Removed: {para[:50]}...")
                 continue
             
@@ -160,7 +221,7 @@ class DisclaimerCleaner:
             return True
         
         # Method 2: Pattern matching
-        if any(p.search(text) for p in self._compiled_patterns):
+        if self._boilerplate_re.search(text):
             return True
         
         return False
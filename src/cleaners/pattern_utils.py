@@ -0,0 +1,32 @@
+"""
+Pattern Utilities
+Helpers for matching many regex patterns in a single scan.
+
+Cleaners build their combined patterns as class attributes, so each is compiled once
+per process and shared by every instance (a fresh cleaner is created per PDF).
+"""
+import re
+from typing import List
+
+
+def combine_patterns(patterns: List[str]) -> re.Pattern:
+    """
+    Compile a list of patterns into one alternation, so "does any pattern match?"
+    is answered by a single regex scan instead of one scan per pattern.
+
+    A leading global (?i) flag is rewritten as a scoped (?i:...) group so it keeps
+    applying only to its own pattern.
+
+    Args:
+        patterns: Regex pattern strings
+
+    Returns:
+        Compiled pattern matching wherever any of the input patterns matches
+    """
+    alternatives = []
+    for pattern in patterns:
+        if pattern.startswith('(?i)'):
+            alternatives.append(f"(?i:{pattern[4:]})")
+        else:
+            alternatives.append(f"(?:{pattern})")
+    return re.compile('|'.join(alternatives))
@@ -25,6 +25,17 @@ class Config:
     FREQUENCY_PENALTY = float(os.getenv("FREQUENCY_PENALTY", "0.0"))
     PRESENCE_PENALTY = float(os.getenv("PRESENCE_PENALTY", "0.0"))
     
+    # Concurrency (max LLM requests in flight across the batch)
+    MAX_CONCURRENT_LLM = int(os.getenv("MAX_CONCURRENT_LLM", "8"))
+    # Provider rate limits used to pace LLM calls (0 = unlimited)
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+    # Character budget for the email text sent to the LLM; longer text is pruned to the
+    # paragraphs relevant to the extraction fields (0 = always send the full text)
+    CONTEXT_PRUNE_MAX_CHARS = int(os.getenv("CONTEXT_PRUNE_MAX_CHARS", "0"))
+    # Worker processes for page extraction within one PDF (0 = auto: cores left over by the batch pool)
+    PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", "0"))
+    
     # Tesseract OCR
     # Tesseract OCR
     TESSERACT_CMD = os.getenv("TESSERACT_CMD")
@@ -45,13 +56,15 @@ class Config:
     # Directory Paths
     PROJECT_ROOT = Path(__file__).parent.parent
     OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "./outputs"))
+    LLM_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", "./cache/llm"))
+    EXTRACT_CACHE_DIR = Path(os.getenv("EXTRACT_CACHE_DIR", "./cache/extraction"))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     ENABLE_CONSOLE_LOGGING = os.getenv("ENABLE_CONSOLE_LOGGING", "true").lower() == "true"
     
     # Text Cleaning Patterns
-    # Note: Regexes are managed internally by src.cleaners.text_cleaners.ContentCleaner
+    # Note: Regexes are managed internally by src.cleaners.deterministic_cleaner and its sub-cleaners
     
     # Field Defaults
     DEFAULT_SCHEME_PERIOD = "Duration"
@@ -2,14 +2,19 @@
 DSPy Field Extraction Module
 Clean, minimal implementation leveraging DSPy Chain-of-Thought for all 20 fields.
 """
+import hashlib
 import re
 from datetime import datetime
-from typing import Dict, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 import dspy
 
+from . import signatures
 from .signatures import SchemeExtractionSignature
 from ..logger import FieldLevelLogger
 from ..config import Config
+from ..utils.rate_limiter import TokenBucketRateLimiter
 
 
 class RetailerHubFieldExtractor:
@@ -18,13 +23,17 @@ class RetailerHubFieldExtractor:
     Trusts LLM outputs from Chain-of-Thought reasoning.
     """
     
-    def __init__(self, logger: FieldLevelLogger):
-        """Initialize with logger and DSPy ChainOfThought module."""
+    # Saved Few-Shot program, regenerated by re-optimization
+    OPTIMIZED_PATH = Config.PROJECT_ROOT / "src" / "dspy_modules" / "optimized_extractor.json"
+    
+    def __init__(self, logger: FieldLevelLogger, rate_limiter: Optional[TokenBucketRateLimiter] = None):
+        """Initialize with logger, optional shared rate limiter and DSPy ChainOfThought module."""
         self.logger = logger
+        self.rate_limiter = rate_limiter
         self.demos_loaded = []  # Store for logging
         
         # Try to load optimized program
-        optimized_path = Config.PROJECT_ROOT / "src" / "dspy_modules" / "optimized_extractor.json"
+        optimized_path = self.OPTIMIZED_PATH
         
         # Initialize the ChainOfThought module
         self.cot_extractor = dspy.ChainOfThought(SchemeExtractionSignature)
@@ -95,6 +104,22 @@ class RetailerHubFieldExtractor:
         "sub_periods": "sub_periods"
     }
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def program_fingerprint() -> str:
+        """
+        Hash of the signature, the optimized Few-Shot program and this module; it changes
+        whenever the prompt, a demo or the extraction code does (used as a cache key).
+        """
+        digest = hashlib.sha256()
+        for path in (Path(signatures.__file__), RetailerHubFieldExtractor.OPTIMIZED_PATH, Path(__file__)):
+            try:
+                digest.update(path.read_bytes())
+            except FileNotFoundError:
+                pass  # No optimized program - Zero-Shot
+            digest.update(b"\x00")
+        return digest.hexdigest()
+    
     def extract_fields(
         self,
         email_text: str,
@@ -105,6 +130,58 @@ class RetailerHubFieldExtractor:
         Extract all fields using DSPy Chain-of-Thought.
         Returns tuple: (final_output_json, full_reasoning_json, token_stats)
         """
+        inputs = self._prepare_inputs(email_text, table_data, xlsx_data)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(self._estimate_tokens(inputs))
+        
+        try:
+            # Call DSPy Chain-of-Thought
+            result = self.cot_extractor(**inputs)
+        except Exception as e:
+            self.logger.error(f"DSPy extraction failed: {str(e)}")
+            raise
+        
+        return self._process_result(result, email_text, self._get_actual_token_usage(email_text))
+    
+    async def predict_async(self, email_text: str, table_data: str = "", xlsx_data: str = "") -> Tuple[Dict, Dict]:
+        """
+        Run the Chain-of-Thought call only, without post-processing (see process_prediction).
+        Uses DSPy's native async call, so concurrent PDFs are pipelined over the LM
+        client's shared connection pool instead of one thread per request.
+        
+        Returns:
+            Tuple of (raw prediction fields, token_stats) - JSON-serializable, so the
+            prediction can be cached and post-processed again later
+        """
+        inputs = self._prepare_inputs(email_text, table_data, xlsx_data)
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async(self._estimate_tokens(inputs))
+        
+        try:
+            result = await self.cot_extractor.acall(**inputs)
+        except Exception as e:
+            self.logger.error(f"DSPy extraction failed: {str(e)}")
+            raise
+        
+        return result.toDict(), self._get_actual_token_usage(email_text)
+    
+    def process_prediction(self, prediction: Dict, email_text: str, token_stats: Dict):
+        """
+        Apply the deterministic overrides and validation to raw prediction fields.
+        
+        Args:
+            prediction: Raw fields from predict_async (fresh or cached)
+            email_text: Email text the overrides scan for trigger keywords
+            token_stats: Token usage to report for this extraction
+        
+        Returns:
+            Tuple of (output, reasoning, token_stats, all_fields)
+        """
+        # A fresh Prediction each time - post-processing writes reasoning back onto it
+        return self._process_result(dspy.Prediction(**prediction), email_text, token_stats)
+    
+    def _prepare_inputs(self, email_text: str, table_data: str, xlsx_data: str) -> Dict:
+        """Log the extraction context and build the (truncated) ChainOfThought inputs."""
         self.logger.section("LLM Field Extraction with DSPy Chain-of-Thought")
         
         # Log input context
@@ -139,32 +216,31 @@ class RetailerHubFieldExtractor:
              self.logger.info("ℹ Using Zero-Shot (No examples loaded)", console_only=True)
              self.logger.debug(f"COT Extractor vars: {vars(self.cot_extractor).keys()}")
         
-        try:
-            # --- TOKEN OPTIMIZATION: Truncate large inputs ---
-            # Most table/xlsx data is redundant after the first few rows for RULE extraction.
-            def truncate(text, max_lines=50):
-                if not text: return text
-                lines = text.splitlines()
-                if len(lines) > max_lines:
-                    return "\n".join(lines[:max_lines]) + "\n... [TRUNCATED FOR TOKEN EFFICIENCY]"
-                return text
-
-            # Truncate Table and XLSX data to 50 lines each
-            optimized_table = truncate(table_data or "No table data available")
-            optimized_xlsx = truncate(xlsx_data or "No XLSX data provided")
-            
-            self.logger.info(f"Inputs Optimized: Email ({len(email_text)} ch) | Table ({len(optimized_table)} ch) | XLSX ({len(optimized_xlsx)} ch)", console_only=True)
+        # --- TOKEN OPTIMIZATION: Truncate large inputs ---
+        # Most table/xlsx data is redundant after the first few rows for RULE extraction.
+        def truncate(text, max_lines=50):
+            if not text: return text
+            lines = text.splitlines()
+            if len(lines) > max_lines:
+                return "\n".join(lines[:max_lines]) + "\n... [TRUNCATED FOR TOKEN EFFICIENCY]"
+            return text
 
-            # Call DSPy Chain-of-Thought
-            result = self.cot_extractor(
-                email_text=email_text,
-                table_data=optimized_table,
-                xlsx_data=optimized_xlsx
-            )
-            
-            # Capture actual token usage
-            token_stats = self._get_actual_token_usage()
-            
+        # Truncate Table and XLSX data to 50 lines each
+        optimized_table = truncate(table_data or "No table data available")
+        optimized_xlsx = truncate(xlsx_data or "No XLSX data provided")
+        
+        self.logger.info(f"Inputs Optimized: Email ({len(email_text)} ch) | Table ({len(optimized_table)} ch) | XLSX ({len(optimized_xlsx)} ch)", console_only=True)
+        
+        return {"email_text": email_text, "table_data": optimized_table, "xlsx_data": optimized_xlsx}
+    
+    @staticmethod
+    def _estimate_tokens(inputs: Dict) -> int:
+        """Rough prompt + completion budget for rate limiting (~4 chars per token)."""
+        return sum(len(value) for value in inputs.values()) // 4 + Config.MAX_TOKENS
+    
+    def _process_result(self, result, email_text: str, token_stats: Dict):
+        """Post-process a ChainOfThought prediction into (output, reasoning, token_stats, all_fields)."""
+        try:
             # Check if response was truncated (common issue with Few-Shot)
             if hasattr(result, 'scheme_type') and result.scheme_type is None:
                 self.logger.warning("⚠️  LLM response appears truncated. Consider increasing --max-tokens (current: {})".format(Config.MAX_TOKENS))
@@ -275,10 +351,12 @@ class RetailerHubFieldExtractor:
             self.logger.error(f"DSPy extraction failed: {str(e)}")
             raise
     
-    def _get_actual_token_usage(self) -> Dict:
+    def _get_actual_token_usage(self, email_text: str = "") -> Dict:
         """
         Get actual token usage from DSPy's LM history.
         This captures the real prompt size including few-shot examples.
+        The LM is shared by concurrent extractions, so the history entry is matched
+        on this call's email text rather than assumed to be the last one.
         """
         try:
             lm = dspy.settings.lm
@@ -286,6 +364,12 @@ class RetailerHubFieldExtractor:
                 return {"input_tokens": 0, "output_tokens": 0, "total_chars": 0}
             
             last_call = lm.history[-1]
+            if email_text:
+                last_call = next(
+                    (entry for entry in reversed(lm.history)
+                     if any(email_text in str(m.get('content', '')) for m in entry.get('messages') or [])),
+                    last_call
+                )
             messages = last_call.get('messages', [])
             
             if not messages:
@@ -307,12 +391,23 @@ class RetailerHubFieldExtractor:
                 else:
                     total_input_chars += len(content)
             
-            input_tokens = total_input_chars // 4
-            output_tokens = actual_output_chars // 4
+            # Provider-reported token counts when present; chars/4 estimate otherwise
+            usage = last_call.get('usage') or {}
+            input_tokens = usage.get('prompt_tokens') or total_input_chars // 4
+            output_tokens = usage.get('completion_tokens') or actual_output_chars // 4
+            
+            # Prompt tokens the provider served from its prompt cache (billed at a discount).
+            # Only meaningful against the provider's prompt_tokens, never the estimate
+            cached_tokens = 0
+            if usage.get('prompt_tokens'):
+                details = usage.get('prompt_tokens_details')
+                cached_tokens = (details.get('cached_tokens') if isinstance(details, dict)
+                                 else getattr(details, 'cached_tokens', 0)) or 0
             
             return {
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
+                "cached_tokens": min(cached_tokens, input_tokens),
                 "total_chars": total_input_chars + actual_output_chars,
                 "input_chars": total_input_chars,
                 "output_chars": actual_output_chars
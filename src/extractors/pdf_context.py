@@ -0,0 +1,94 @@
+"""
+Shared PDF Document
+Opens a PDF once for the text and table extraction stages and caches per-page table detection.
+"""
+import contextlib
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import pdfplumber
+
+
+class PdfDocumentContext:
+    """
+    One pdfplumber document shared by PDFExtractor and TableExtractor.
+
+    The document is opened on first use, so an unreadable PDF fails inside the
+    extractor's own error handling (and OCR fallback) exactly as before.
+    Table detection is the costliest per-page step and both stages need it - text
+    extraction masks table regions, table extraction reads them - so each page's
+    tables are found once and kept as (bbox, rows).
+    """
+
+    def __init__(self, pdf_path: Path, source: Optional[BinaryIO] = None):
+        """
+        Initialize context (nothing is parsed yet).
+
+        Args:
+            pdf_path: Path to PDF file
+            source: Optional already-open copy of the file (e.g. an mmap) parsed instead of pdf_path
+        """
+        self.pdf_path = pdf_path
+        self._source = source
+        self._pdf = None
+        self._tables: Dict[int, List[Tuple[tuple, list]]] = {}
+
+    @property
+    def pdf(self) -> pdfplumber.PDF:
+        """The open pdfplumber document."""
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self._source if self._source is not None else self.pdf_path)
+        return self._pdf
+
+    def page_tables(self, page_num: int, page=None) -> List[Tuple[tuple, list]]:
+        """
+        Tables on a page as (bbox, rows), detected on the first request for that page.
+
+        Args:
+            page_num: 1-based page number
+            page: The page object, if the caller already holds it
+
+        Returns:
+            List of (bbox, rows) in pdfplumber's find_tables() order
+        """
+        tables = self._tables.get(page_num)
+        if tables is None:
+            if page is None:
+                page = self.pdf.pages[page_num - 1]
+            tables = [(table.bbox, table.extract()) for table in page.find_tables()]
+            self._tables[page_num] = tables
+        return tables
+
+    def set_page_tables(self, page_num: int, tables: List[Tuple[tuple, list]]):
+        """
+        Record tables detected elsewhere (e.g. in a page-extraction worker process).
+
+        Args:
+            page_num: 1-based page number
+            tables: List of (bbox, rows) in pdfplumber's find_tables() order
+        """
+        self._tables[page_num] = tables
+
+    def close(self):
+        """Close the document and drop cached tables."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        self._tables.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_pdf(pdf_path: Path, doc: Optional[PdfDocumentContext] = None):
+    """
+    Context manager for a pdfplumber document: the shared one (left open on exit) or a fresh one.
+
+    Args:
+        pdf_path: Path to PDF file, opened when no shared document is given
+        doc: Optional shared document
+    """
+    return contextlib.nullcontext(doc.pdf) if doc is not None else pdfplumber.open(pdf_path)
@@ -13,29 +13,131 @@ except ImportError:
 import pdfplumber
 import pytesseract
 from PIL import Image
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Iterator, List, Tuple, Optional, TextIO
 
 from ..config import Config
+from .pdf_context import PdfDocumentContext, open_pdf
 
 
 class PDFExtractor:
     """Extracts text from PDFs using pdfplumber (primary) with OCR fallback."""
     
+    # Below this many pages, worker start-up costs more than splitting the pages saves
+    PARALLEL_MIN_PAGES = 16
+    
     def __init__(self, tesseract_cmd: Optional[str] = None):
         """Initialize PDF extractor."""
+        # True when the last extract() fell back to pdfplumber's minimal text because OCR failed
+        self.degraded = False
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
         elif Config.TESSERACT_CMD:
             pytesseract.pytesseract.tesseract_cmd = Config.TESSERACT_CMD
     
-    def extract_text_pdfplumber(self, pdf_path: Path, exclude_tables: bool = True) -> Tuple[str, int]:
+    @staticmethod
+    def _append_part(text_parts: list, part: str, sink: Optional[TextIO]):
+        """Append a text part, streaming it to sink with the same newline joins as the returned text."""
+        if sink is not None:
+            sink.write(f"\n{part}" if text_parts else part)
+        text_parts.append(part)
+    
+    @staticmethod
+    def _reset_sink(sink: Optional[TextIO]):
+        """Discard anything already streamed to sink (used when switching extraction method)."""
+        if sink is not None:
+            sink.seek(0)
+            sink.truncate()
+    
+    @staticmethod
+    def _page_text(page, exclude_tables: bool, table_bboxes: Optional[List[tuple]] = None) -> str:
+        """
+        Extract one pdfplumber page's text, then release the page's parsed layout objects.
+        table_bboxes can pass in already-detected table regions instead of finding them again.
+        """
+        if exclude_tables:
+            # Get table bounding boxes and page dimensions
+            if table_bboxes is None:
+                table_bboxes = [table.bbox for table in page.find_tables()]
+            height = page.height
+            
+            # Define Header/Footer margins (approx 50px or 5-7% of page)
+            header_margin = 50
+            footer_margin = height - 50
+            
+            # Gather all exclusion zones (Tables + Header + Footer)
+            exclusion_bboxes = []
+            
+            # 1. Tables
+            exclusion_bboxes.extend(table_bboxes)
+            
+            # 2. Header (Full width, top 50px)
+            exclusion_bboxes.append((0, 0, page.width, header_margin))
+            
+            # 3. Footer (Full width, bottom 50px)
+            exclusion_bboxes.append((0, footer_margin, page.width, height))
+                
+            # Filter out characters within exclusion zones
+            def not_within_exclusions(obj):
+                """Check if object is outside all exclusion regions."""
+                if obj.get('object_type') not in ['char', 'line', 'rect']:
+                    return True
+                obj_x = obj.get('x0', 0)
+                obj_y = obj.get('top', obj.get('y0', 0))
+                
+                for bbox in exclusion_bboxes:
+                    # bbox format: (x0, top, x1, bottom)
+                    if (bbox[0] <= obj_x <= bbox[2] and 
+                        bbox[1] <= obj_y <= bbox[3]):
+                        return False
+                return True
+            
+            # Filter page and extract text
+            filtered_page = page.filter(not_within_exclusions)
+            text = filtered_page.extract_text()
+        else:
+            # Extract all text including tables
+            text = page.extract_text()
+        
+        # Drop this page's parsed layout objects so memory stays flat on long PDFs
+        page.close()
+        return text
+    
+    @staticmethod
+    def _iter_pages_parallel(pdf_path: Path, num_pages: int, exclude_tables: bool, workers: int,
+                             doc: Optional[PdfDocumentContext] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Extract contiguous page ranges in worker processes and yield (page_num, text) in page order.
+        Tables the workers detect are handed to doc, so the table stage does not detect them again.
+        """
+        workers = min(workers, num_pages)
+        bounds = [(i * num_pages // workers, (i + 1) * num_pages // workers) for i in range(workers)]
+        with_tables = doc is not None and exclude_tables
+        
+        # Spawned workers: the caller may already be running threads (log listeners)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(_extract_page_range, pdf_path, start, end, exclude_tables, with_tables)
+                       for start, end in bounds]
+            for future in futures:
+                for page_num, text, tables in future.result():
+                    if with_tables:
+                        doc.set_page_tables(page_num, tables)
+                    yield page_num, text
+    
+    def extract_text_pdfplumber(self, pdf_path: Path, exclude_tables: bool = True, sink: Optional[TextIO] = None,
+                                workers: int = 1, doc: Optional[PdfDocumentContext] = None) -> Tuple[str, int]:
         """
         Extract text using pdfplumber (primary method).
         
         Args:
             pdf_path: Path to PDF file
             exclude_tables: If True, exclude text from table regions to avoid redundancy
+            sink: Optional open text file; each page is written to it as soon as it is extracted
+            workers: Worker processes to split pages across; used for PDFs of at least
+                     PARALLEL_MIN_PAGES pages (1 = extract serially)
+            doc: Optional shared document (also caches table detection for the table stage)
         
         Returns:
             Tuple of (extracted_text, num_pages)
@@ -43,70 +145,37 @@ class PDFExtractor:
         text_parts = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            with open_pdf(pdf_path, doc) as pdf:
                 num_pages = len(pdf.pages)
                 
-                for page_num, page in enumerate(pdf.pages, 1):
-                    if exclude_tables:
-                        # Get table bounding boxes and page dimensions
-                        tables = page.find_tables()
-                        height = page.height
-                        
-                        # Define Header/Footer margins (approx 50px or 5-7% of page)
-                        header_margin = 50
-                        footer_margin = height - 50
-                        
-                        # Gather all exclusion zones (Tables + Header + Footer)
-                        exclusion_bboxes = []
-                        
-                        # 1. Tables
-                        if tables:
-                            exclusion_bboxes.extend([table.bbox for table in tables])
-                        
-                        # 2. Header (Full width, top 50px)
-                        exclusion_bboxes.append((0, 0, page.width, header_margin))
-                        
-                        # 3. Footer (Full width, bottom 50px)
-                        exclusion_bboxes.append((0, footer_margin, page.width, height))
-                            
-                        # Filter out characters within exclusion zones
-                        def not_within_exclusions(obj):
-                            """Check if object is outside all exclusion regions."""
-                            if obj.get('object_type') not in ['char', 'line', 'rect']:
-                                return True
-                            obj_x = obj.get('x0', 0)
-                            obj_y = obj.get('top', obj.get('y0', 0))
-                            
-                            for bbox in exclusion_bboxes:
-                                # bbox format: (x0, top, x1, bottom)
-                                if (bbox[0] <= obj_x <= bbox[2] and 
-                                    bbox[1] <= obj_y <= bbox[3]):
-                                    return False
-                            return True
-                        
-                        # Filter page and extract text
-                        filtered_page = page.filter(not_within_exclusions)
-                        text = filtered_page.extract_text()
-                    else:
-                        # Extract all text including tables
-                        text = page.extract_text()
-                    
+                if workers > 1 and num_pages >= self.PARALLEL_MIN_PAGES:
+                    pages = self._iter_pages_parallel(pdf_path, num_pages, exclude_tables, workers, doc)
+                elif doc is not None and exclude_tables:
+                    # Detect tables through the shared document so the table stage can reuse them
+                    pages = ((page_num, self._page_text(page, True, [bbox for bbox, _ in doc.page_tables(page_num, page)]))
+                             for page_num, page in enumerate(pdf.pages, 1))
+                else:
+                    pages = ((page_num, self._page_text(page, exclude_tables)) for page_num, page in enumerate(pdf.pages, 1))
+                
+                for page_num, text in pages:
                     if text:
-                        text_parts.append(f"\n--- Page {page_num} ---\n")
-                        text_parts.append(text)
+                        self._append_part(text_parts, f"\n--- Page {page_num} ---\n", sink)
+                        self._append_part(text_parts, text, sink)
                 
                 return "\n".join(text_parts), num_pages
         
         except Exception as e:
             raise Exception(f"pdfplumber extraction failed: {str(e)}")
     
-    def extract_text_ocr(self, pdf_path: Path) -> Tuple[str, int]:
+    def extract_text_ocr(self, pdf_path: Path, sink: Optional[TextIO] = None) -> Tuple[str, int]:
         """
         Extract text using OCR (for scanned PDFs).
         Uses pdfplumber to render pages to images for OCR.
+        Always opens pdf_path itself: page rendering (pypdfium2) cannot read a memory-mapped stream.
         
         Args:
             pdf_path: Path to PDF file
+            sink: Optional open text file; each page is written to it as soon as it is recognised
         
         Returns:
             Tuple of (extracted_text, num_pages)
@@ -123,17 +192,20 @@ class PDFExtractor:
                     
                     # Perform OCR on the PIL image
                     text = pytesseract.image_to_string(im.original)
+                    im.original.close()
+                    page.close()
                     
                     if text.strip():
-                        text_parts.append(f"\n--- Page {page_num} (OCR) ---\n")
-                        text_parts.append(text)
+                        self._append_part(text_parts, f"\n--- Page {page_num} (OCR) ---\n", sink)
+                        self._append_part(text_parts, text, sink)
                 
                 return "\n".join(text_parts), num_pages
         
         except Exception as e:
             raise Exception(f"OCR extraction failed ({type(e).__name__}): {str(e)}")
     
-    def extract(self, pdf_path: Path) -> Tuple[str, int]:
+    def extract(self, pdf_path: Path, output_path: Optional[Path] = None, workers: int = 1,
+                doc: Optional[PdfDocumentContext] = None) -> Tuple[str, int]:
         """
         Extract text with automatic fallback strategy.
         
@@ -143,13 +215,28 @@ class PDFExtractor:
         
         Args:
             pdf_path: Path to PDF file
+            output_path: Optional raw text dump; pages are streamed to it during extraction
+                         instead of writing the whole text again afterwards
+            workers: Worker processes for pdfplumber page extraction (1 = serial)
+            doc: Optional shared document, reused by the table stage
         
         Returns:
             Tuple of (extracted_text, num_pages)
         """
+        if output_path is None:
+            return self._extract(pdf_path, None, workers, doc)
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as sink:
+            return self._extract(pdf_path, sink, workers, doc)
+    
+    def _extract(self, pdf_path: Path, sink: Optional[TextIO], workers: int = 1,
+                 doc: Optional[PdfDocumentContext] = None) -> Tuple[str, int]:
+        """Fallback strategy behind extract(), streaming the winning method's pages to sink."""
+        self.degraded = False
         # Try pdfplumber first
         try:
-            text, num_pages = self.extract_text_pdfplumber(pdf_path)
+            text, num_pages = self.extract_text_pdfplumber(pdf_path, sink=sink, workers=workers, doc=doc)
             
             # Check if we got meaningful text (more than 100 chars)
             if len(text.strip()) > 100:
@@ -158,17 +245,38 @@ class PDFExtractor:
             # Not enough text, use OCR
             print(f"  Minimal text found ({len(text.strip())} chars), trying OCR for {pdf_path.name}...")
             try:
-                ocr_text, ocr_pages = self.extract_text_ocr(pdf_path)
+                self._reset_sink(sink)
+                ocr_text, ocr_pages = self.extract_text_ocr(pdf_path, sink=sink)
                 return ocr_text, ocr_pages
             except Exception as ocr_e:
                 print(f"  ⚠️ OCR failed: {str(ocr_e)}")
                 print(f"  Returning minimal text extracted by pdfplumber.")
+                self.degraded = True
+                self._reset_sink(sink)
+                if sink is not None:
+                    sink.write(text)
                 return text, num_pages
         
         except Exception as e:
             # If pdfplumber failed completely, try OCR as last resort
             try:
                 print(f"  Standard extraction failed ({str(e)}), trying OCR for {pdf_path.name}...")
-                return self.extract_text_ocr(pdf_path)
+                self._reset_sink(sink)
+                return self.extract_text_ocr(pdf_path, sink=sink)
             except Exception as ocr_error:
                 raise Exception(f"All extraction methods failed. PDFPlumber error: {str(e)}. OCR error: {str(ocr_error)}")
+
+
+def _extract_page_range(pdf_path: Path, start: int, end: int, exclude_tables: bool, with_tables: bool = False) -> list:
+    """
+    Extract (page_num, text, tables) for pages [start, end). Top-level so it can run in a worker process.
+    With with_tables, tables are returned as (bbox, rows) for the parent's shared document; otherwise None.
+    """
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in range(start + 1, end + 1):
+            page = pdf.pages[page_num - 1]
+            tables = [(table.bbox, table.extract()) for table in page.find_tables()] if with_tables else None
+            text = PDFExtractor._page_text(page, exclude_tables, [bbox for bbox, _ in tables] if with_tables else None)
+            results.append((page_num, text, tables))
+    return results
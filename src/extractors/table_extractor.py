@@ -2,16 +2,16 @@
 Table Extraction Module
 Consolidates all tables into a single CSV file.
 """
-import pdfplumber
 import pandas as pd
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 try:
     import fitz  # PyMuPDF
 except ImportError:
     pass  # PyMuPDF is optional here
 from PIL import Image
 from io import BytesIO
+from .pdf_context import PdfDocumentContext, open_pdf
 try:
     from img2table.document import PDF
     from img2table.ocr import TesseractOCR
@@ -26,13 +26,17 @@ class TableExtractor:
     def __init__(self):
         """Initialize table extractor."""
         self.ocr = TesseractOCR() if IMG2TABLE_AVAILABLE else None
+        # True when the last extract_and_consolidate() may have missed tables: a method failed,
+        # or pdfplumber found none and the img2table (OCR) fallback is unavailable
+        self.degraded = False
     
-    def extract_tables_pdfplumber(self, pdf_path: Path) -> List[pd.DataFrame]:
+    def extract_tables_pdfplumber(self, pdf_path: Path, doc: Optional[PdfDocumentContext] = None) -> List[pd.DataFrame]:
         """
         Extract tables using pdfplumber.
         
         Args:
             pdf_path: Path to PDF file
+            doc: Optional shared document; tables already detected during text extraction are reused
         
         Returns:
             List of DataFrames (one per table)
@@ -40,9 +44,13 @@ class TableExtractor:
         tables = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            with open_pdf(pdf_path, doc) as pdf:
                 for page_num, page in enumerate(pdf.pages, 1):
-                    page_tables = page.extract_tables()
+                    if doc is not None:
+                        # Reuse detection done during text extraction (or detect and cache now)
+                        page_tables = [rows for _, rows in doc.page_tables(page_num, page)]
+                    else:
+                        page_tables = page.extract_tables()
                     
                     for table_idx, table in enumerate(page_tables):
                         if table:
@@ -72,6 +80,7 @@ class TableExtractor:
         
         except Exception as e:
             print(f"pdfplumber table extraction warning: {str(e)}")
+            self.degraded = True
         
         return tables
     
@@ -108,39 +117,49 @@ class TableExtractor:
         
         except Exception as e:
             print(f"img2table extraction warning: {str(e)}")
+            self.degraded = True
         
         return tables
     
-    def extract_and_consolidate(self, pdf_path: Path, output_csv: Path) -> int:
+    def extract_and_consolidate(self, pdf_path: Path, output_csv: Path, doc: Optional[PdfDocumentContext] = None) -> Tuple[int, str]:
         """
         Extract all tables and save to single CSV.
+        The CSV text is also returned, so callers need not read the file back.
         
         Args:
             pdf_path: Path to PDF file
             output_csv: Path to output CSV file
+            doc: Optional shared document; tables already detected during text extraction are reused
         
         Returns:
-            Number of tables extracted
+            Tuple of (number of tables extracted, CSV text or "" when no tables were found)
         """
         all_tables = []
+        self.degraded = False
         
         # Try pdfplumber first
-        tables = self.extract_tables_pdfplumber(pdf_path)
+        tables = self.extract_tables_pdfplumber(pdf_path, doc)
         all_tables.extend(tables)
         
         # If no tables found, try img2table
         if not all_tables and IMG2TABLE_AVAILABLE:
             tables = self.extract_tables_img2table(pdf_path)
             all_tables.extend(tables)
+        elif not all_tables:
+            # Image-based tables can't be detected without img2table
+            self.degraded = True
         
         # Consolidate and save
         if all_tables:
             consolidated_df = pd.concat(all_tables, ignore_index=True)
-            consolidated_df.to_csv(output_csv, index=False, encoding='utf-8')
-            return len(all_tables)
+            # "\n" here and newline translation on write give the same bytes as to_csv(output_csv)
+            csv_text = consolidated_df.to_csv(index=False, lineterminator='\n')
+            with open(output_csv, 'w', encoding='utf-8') as f:
+                f.write(csv_text)
+            return len(all_tables), csv_text
         else:
             # Create empty CSV with header
             pd.DataFrame(columns=['source_page', 'table_id', 'note']).to_csv(
                 output_csv, index=False
             )
-            return 0
+            return 0, ""
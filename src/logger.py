@@ -29,6 +29,8 @@ Version: 2.0 - Enhanced for Beginners
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -68,7 +70,41 @@ class FieldLevelLogger:
     =================================================================================
     """
     
-    def __init__(self, log_file: Optional[Path] = None, console_enabled: bool = True):
+    # Field descriptions from Retailer Hub documentation (for beginner-friendly logs)
+    # Shared by every instance - one logger is created per PDF
+    FIELD_DESCRIPTIONS = {
+        "scheme_name": "Scheme description – usually mail subject line",
+        "scheme_description": "Optional – any important conditions or details mentioned in the brand email",
+        "scheme_period": "Type of period (Duration or Event). Less than 1% of claims are 'Event' based.",
+        "duration": "The validity period of the scheme (start date to end date)",
+        "discount_type": "Basis of calculation: Percentage of NLC (Net Landing Cost), Percentage of MRP, or Absolute amount",
+        "max_cap": "The global cap or maximum support amount mentioned by the brand in the mail",
+        "vendor_name": "Official name of the vendor/brand providing the support",
+        "price_drop_date": "Only applicable for Price Drop Claims (PDC). This is the date the price drop set in.",
+        "start_date": "The start date of the scheme validity period",
+        "end_date": "The end date of the scheme validity period",
+        "fsn_file_config_file": "Indicates if FSN-level configuration files need to be prepared for this scheme",
+        "min_actual_discount_or_agreed_claim": "Must be checked if any limit or cap is mentioned for the discount/claim",
+        "remove_gst_from_final_claim": "Select 'Yes' if prices are inclusive of tax, 'No' if exclusive of tax",
+        "over_and_above": "Set if this is additional support over an existing scheme (overrides duplicity checks)",
+        "scheme_document": "Referenced documents like brand letters or signed agreements",
+        "discount_slab_type": "Used for Buy-side Periodic schemes to define how support scales with quantity",
+        "best_bet": "Optimization flag used for Buy-side Periodic schemes based on mail details",
+        "brand_support_absolute": "The fixed rupee amount of support per unit (typically for One-Off/OFC claims)",
+        "gst_rate": "The applicable GST percentage for the claim amount",
+        "scheme_type": "High-level classification (BUY_SIDE, SELL_SIDE, PDC, etc.)",
+        "scheme_subtype": "Specific claim mechanism (PUC, CP, LS, PRX, etc.)",
+        
+        # Config specifics
+        "config_brand_support": "The specific support value (percentage or absolute) per unit for configuration",
+        "config_vendor_split_ratio": "The funding split between Vendor and Flipkart (e.g., 80:20 means vendor pays 80%)",
+        "config_unit_slab_lower": "The minimum quantity threshold (start) for a specific pricing slab",
+        "config_unit_slab_upper": "The maximum quantity threshold (end) for a specific pricing slab",
+        "config_max_support_value": "The maximum monetary support allowed for this specific configuration",
+        "config_margin": "The profit margin agreed upon for this scheme"
+    }
+    
+    def __init__(self, log_file: Optional[Path] = None, console_enabled: bool = True, append: bool = False):
         """
         Initialize the logger with file and console handlers.
         
@@ -78,6 +114,9 @@ class FieldLevelLogger:
             Where to save the detailed log file. If None, only console logging is used.
         console_enabled : bool
             Whether to show colorful output in the terminal. Default is True.
+        append : bool
+            Continue an existing log file instead of starting a new one. Used when a
+            later pipeline stage (e.g. the LLM stage) runs in a different process.
         
         WHAT HAPPENS:
         -------------
@@ -92,6 +131,7 @@ class FieldLevelLogger:
         self.logger.handlers.clear()  # Remove any existing handlers
         self.console_enabled = console_enabled
         self.log_file = log_file
+        self._listener = None
         
         # Performance tracking - we'll measure how long each stage takes
         self._start_time = datetime.now()
@@ -101,53 +141,26 @@ class FieldLevelLogger:
         self._current_stage = ""
         self._stage_count = 0
         self._total_stages = 5  # PDF extraction, table extraction, cleaning, LLM, saving
-
-        # Field descriptions from Retailer Hub documentation (for beginner-friendly logs)
-        self.FIELD_DESCRIPTIONS = {
-            "scheme_name": "Scheme description – usually mail subject line",
-            "scheme_description": "Optional – any important conditions or details mentioned in the brand email",
-            "scheme_period": "Type of period (Duration or Event). Less than 1% of claims are 'Event' based.",
-            "duration": "The validity period of the scheme (start date to end date)",
-            "discount_type": "Basis of calculation: Percentage of NLC (Net Landing Cost), Percentage of MRP, or Absolute amount",
-            "max_cap": "The global cap or maximum support amount mentioned by the brand in the mail",
-            "vendor_name": "Official name of the vendor/brand providing the support",
-            "price_drop_date": "Only applicable for Price Drop Claims (PDC). This is the date the price drop set in.",
-            "start_date": "The start date of the scheme validity period",
-            "end_date": "The end date of the scheme validity period",
-            "fsn_file_config_file": "Indicates if FSN-level configuration files need to be prepared for this scheme",
-            "min_actual_discount_or_agreed_claim": "Must be checked if any limit or cap is mentioned for the discount/claim",
-            "remove_gst_from_final_claim": "Select 'Yes' if prices are inclusive of tax, 'No' if exclusive of tax",
-            "over_and_above": "Set if this is additional support over an existing scheme (overrides duplicity checks)",
-            "scheme_document": "Referenced documents like brand letters or signed agreements",
-            "discount_slab_type": "Used for Buy-side Periodic schemes to define how support scales with quantity",
-            "best_bet": "Optimization flag used for Buy-side Periodic schemes based on mail details",
-            "brand_support_absolute": "The fixed rupee amount of support per unit (typically for One-Off/OFC claims)",
-            "gst_rate": "The applicable GST percentage for the claim amount",
-            "scheme_type": "High-level classification (BUY_SIDE, SELL_SIDE, PDC, etc.)",
-            "scheme_subtype": "Specific claim mechanism (PUC, CP, LS, PRX, etc.)",
-            
-            # Config specifics
-            "config_brand_support": "The specific support value (percentage or absolute) per unit for configuration",
-            "config_vendor_split_ratio": "The funding split between Vendor and Flipkart (e.g., 80:20 means vendor pays 80%)",
-            "config_unit_slab_lower": "The minimum quantity threshold (start) for a specific pricing slab",
-            "config_unit_slab_upper": "The maximum quantity threshold (end) for a specific pricing slab",
-            "config_max_support_value": "The maximum monetary support allowed for this specific configuration",
-            "config_margin": "The profit margin agreed upon for this scheme"
-        }
         
         # Set up file handler for detailed logging
+        # WHY A QUEUE: some records are huge (the full LLM context). The pipeline only
+        # enqueues them; a background thread does the actual file writes.
         if log_file:
             log_file.parent.mkdir(parents=True, exist_ok=True)
-            fh = logging.FileHandler(log_file, encoding='utf-8', mode='w')
+            fh = logging.FileHandler(log_file, encoding='utf-8', mode='a' if append else 'w')
             fh.setLevel(logging.DEBUG)
             fh.setFormatter(logging.Formatter(
                 '[%(asctime)s] [%(levelname)-8s] %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            self.logger.addHandler(fh)
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            self._listener = logging.handlers.QueueListener(log_queue, fh)
+            self._listener.start()
             
             # Write initial log file header
-            self._write_log_file_header()
+            if not append:
+                self._write_log_file_header()
     
     def _write_log_file_header(self):
         """Write an explanatory header at the top of the log file."""
@@ -235,6 +248,14 @@ class FieldLevelLogger:
             self._log_file(message)
             self._console(message, Fore.WHITE)
     
+    @property
+    def debug_enabled(self) -> bool:
+        """
+        True if debug() messages are actually recorded (i.e. a log file is attached).
+        Lets hot loops skip formatting debug messages that would be dropped.
+        """
+        return bool(self.logger.handlers) and self.logger.isEnabledFor(logging.DEBUG)
+    
     def debug(self, message: str):
         """
         Log a debug message (file only, not shown in console).
@@ -1052,12 +1073,29 @@ FIELD EXPLANATIONS:
     # UTILITY METHODS
     # =========================================================================
     
-    def log_llm_context(self, context: str):
-        """Log full LLM context (file only)."""
-        self._log_file(f"FULL LLM CONTEXT:\n{context}", "DEBUG")
+    def log_llm_context(self, context_parts: list):
+        """Log full LLM context (file only), given as the parts that concatenate to it."""
+        self._log_file("".join(["FULL LLM CONTEXT:\n", *context_parts]), "DEBUG")
+    
+    def close(self):
+        """
+        Flush pending log records to disk and release the log file.
+        
+        Call this when a file's processing is done - in particular before another
+        process or stage reopens the same log file in append mode.
+        """
+        if self._listener:
+            self._listener.stop()  # Drains the queue before returning
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        self.logger.handlers.clear()
+        # Every instance registers a uniquely named logger - unregister it so a long
+        # batch (a logger per PDF, per stage) doesn't accumulate them in the logging module
+        logging.Logger.manager.loggerDict.pop(self.logger.name, None)
 
 
-def create_logger(output_dir: Path, console_enabled: bool = True) -> FieldLevelLogger:
+def create_logger(output_dir: Path, console_enabled: bool = True, append: bool = False) -> FieldLevelLogger:
     """
     Factory function to create a configured logger.
     
@@ -1067,6 +1105,8 @@ def create_logger(output_dir: Path, console_enabled: bool = True) -> FieldLevelL
         Directory where the log file will be saved
     console_enabled : bool
         Whether to show colorful console output
+    append : bool
+        Continue the existing processing.log instead of overwriting it
     
     RETURNS:
     --------
@@ -1074,4 +1114,25 @@ def create_logger(output_dir: Path, console_enabled: bool = True) -> FieldLevelL
         A configured logger instance ready for use
     """
     log_file = output_dir / "processing.log"
-    return FieldLevelLogger(log_file=log_file, console_enabled=console_enabled)
+    return FieldLevelLogger(log_file=log_file, console_enabled=console_enabled, append=append)
+
+
+def debug_enabled(logger) -> bool:
+    """
+    Whether debug messages sent to logger would be recorded.
+    
+    Hot loops (e.g. the cleaners' per-paragraph checks) check this once and skip building
+    debug messages that would only be dropped. Loggers without a debug_enabled property
+    are assumed to record everything.
+    
+    PARAMETERS:
+    -----------
+    logger : FieldLevelLogger or None
+        The logger a component was given (None means no logging)
+    
+    RETURNS:
+    --------
+    bool
+        True if debug() calls on this logger are worth making
+    """
+    return logger is not None and getattr(logger, "debug_enabled", True)
@@ -0,0 +1,82 @@
+"""
+Context Pruner
+Trims long email text to the paragraphs relevant to field extraction before it is sent to the LLM.
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet
+
+# Terms the extraction fields key on (see SchemeExtractionSignature field descriptions)
+FIELD_KEYWORDS = frozenset({
+    "scheme", "offer", "support", "plan", "program", "approval", "claim", "payout",
+    "discount", "cashback", "margin", "sellout", "sell-out", "sellin", "sell-in", "jbp",
+    "price drop", "price protection", "pp", "nlc", "mrp", "dmrp", "gst", "over and above",
+    "cap", "maximum", "max", "upto", "up to", "not exceeding", "limit",
+    "valid", "validity", "effective", "w.e.f", "period", "duration", "from", "till", "until",
+    "start", "end", "date", "event", "sale", "diwali", "big billion", "bbd",
+    "fsn", "sku", "model", "series", "brand", "vendor", "city", "cities", "region",
+    "percentage", "percent", "rs", "inr", "amount", "per unit", "slab",
+})
+
+PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+
+
+@lru_cache(maxsize=8)
+def _keyword_re(keywords: FrozenSet[str]) -> re.Pattern:
+    """Compile one case-insensitive alternation for a keyword set (longest terms first)."""
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+def prune(text: str, max_chars: int, keywords: FrozenSet[str] = FIELD_KEYWORDS,
+          keep_head: int = 3, neighbors: int = 1) -> str:
+    """
+    Keep only the paragraphs most likely to matter for field extraction.
+
+    Text within max_chars is returned unchanged. Longer text is split into paragraphs;
+    the opening paragraphs (subject, sender, greeting) are always kept, then the
+    paragraphs with the most keyword hits are added together with their neighbors
+    until the budget is used. Kept paragraphs stay in document order.
+
+    Args:
+        text: Cleaned email text
+        max_chars: Character budget for the pruned text (0 = no pruning)
+        keywords: Terms that mark a paragraph as relevant
+        keep_head: Number of leading paragraphs always kept
+        neighbors: Paragraphs kept on each side of a relevant one, for context
+
+    Returns:
+        Pruned text (paragraphs joined with blank lines)
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+
+    paragraphs = [p for p in PARAGRAPH_SPLIT_RE.split(text) if p.strip()]
+    keyword_re = _keyword_re(frozenset(keywords))
+    scores = [len(keyword_re.findall(p)) for p in paragraphs]
+
+    kept = set()
+    used = 0
+
+    def take(indices) -> bool:
+        """Keep the given paragraphs if they fit the budget; False once it is exhausted."""
+        nonlocal used
+        new = [i for i in indices if 0 <= i < len(paragraphs) and i not in kept]
+        cost = sum(len(paragraphs[i]) + 2 for i in new)
+        if used + cost > max_chars:
+            return False
+        kept.update(new)
+        used += cost
+        return True
+
+    take(range(keep_head))
+    ranked = sorted((i for i, score in enumerate(scores) if score > 0), key=lambda i: (-scores[i], i))
+    for i in ranked:
+        if not take(range(i - neighbors, i + neighbors + 1)):
+            # The window does not fit - try the paragraph on its own
+            take([i])
+
+    if not kept:
+        # No single paragraph fits the budget - pruning would drop everything
+        return text
+    return "\n\n".join(paragraphs[i] for i in sorted(kept))
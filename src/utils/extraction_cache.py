@@ -0,0 +1,177 @@
+"""
+Extraction Cache
+Reuses raw text and table CSVs from earlier runs, keyed by a SHA256 of the PDF bytes and
+extractor code/settings, and cleaned text keyed by the raw text and cleaning rules.
+"""
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+class ExtractionCache:
+    """
+    On-disk cache for the deterministic extraction stages (PDF text + tables).
+
+    Output folders are timestamped per run, so earlier results are kept here and
+    copied into the new run's extracted_text/ on a hit. Each entry is a folder with
+    raw.txt, tables.csv and meta.json; meta.json is written last and marks the
+    entry as complete.
+    """
+
+    # Sources whose changes (table detection, header/footer margins, OCR fallback) alter the output.
+    # Read from disk rather than imported, so a cache hit never loads pdfplumber
+    EXTRACTOR_SOURCES = ("pdf_extractor.py", "table_extractor.py", "pdf_context.py")
+
+    def __init__(self, cache_dir: Path, refresh: bool = False):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cached extractions
+            refresh: Ignore existing entries (re-extract) but still store fresh results
+        """
+        self.cache_dir = Path(cache_dir)
+        self.refresh = refresh
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def extractor_fingerprint(exclude_tables: bool = True) -> str:
+        """
+        Hash of the extractor sources and settings (used as part of make_key).
+
+        Args:
+            exclude_tables: Whether table regions are masked out of the page text
+
+        Returns:
+            Hex SHA256 digest
+        """
+        extractors_dir = Path(__file__).resolve().parent.parent / "extractors"
+        digest = hashlib.sha256(f"exclude_tables={exclude_tables}".encode())
+        for name in ExtractionCache.EXTRACTOR_SOURCES:
+            digest.update(b"\x00")
+            digest.update((extractors_dir / name).read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(pdf_path: Path, data=None, extractor: str = "") -> str:
+        """
+        Build the cache key for a PDF from its content and the extractor that reads it.
+
+        Args:
+            pdf_path: Path to PDF file
+            data: Optional bytes-like copy of the file (e.g. an mmap) hashed instead of re-reading it
+            extractor: Fingerprint from extractor_fingerprint, so extractor changes never reuse stale output
+
+        Returns:
+            Hex SHA256 digest
+        """
+        digest = hashlib.sha256(f"{extractor}\x00".encode())
+        if data is not None:
+            digest.update(data)
+        else:
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_text_key(raw_text: str, rules: str) -> str:
+        """
+        Build the cache key for cleaned text.
+
+        Args:
+            raw_text: Extracted text that is cleaned
+            rules: Fingerprint of the cleaning rules, so rule changes never reuse stale output
+
+        Returns:
+            Hex SHA256 digest
+        """
+        digest = hashlib.sha256(rules.encode())
+        digest.update(raw_text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def _cleaned_entry(self, key: str) -> Path:
+        return self.cache_dir / "cleaned" / key[:2] / f"{key}.json"
+
+    def load(self, key: str, raw_path: Path, table_csv_path: Path) -> Optional[dict]:
+        """
+        Restore a cached extraction into the current output folder.
+
+        Args:
+            key: Cache key from make_key
+            raw_path: Destination for the raw text dump
+            table_csv_path: Destination for the consolidated tables CSV
+
+        Returns:
+            Cached metadata (num_pages, num_tables, method), or None on a miss
+        """
+        if self.refresh:
+            return None
+        entry = self._entry(key)
+        try:
+            with open(entry / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            shutil.copyfile(entry / "raw.txt", raw_path)
+            shutil.copyfile(entry / "tables.csv", table_csv_path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta
+
+    def store(self, key: str, raw_path: Path, table_csv_path: Path, meta: dict):
+        """
+        Save an extraction for later runs.
+
+        Args:
+            key: Cache key from make_key
+            raw_path: Raw text dump produced by this run
+            table_csv_path: Tables CSV produced by this run
+            meta: JSON-serializable metadata (num_pages, num_tables, method)
+        """
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(raw_path, entry / "raw.txt")
+        shutil.copyfile(table_csv_path, entry / "tables.csv")
+        tmp_path = entry / f"meta.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, entry / "meta.json")
+
+    def load_cleaned(self, key: str) -> Optional[dict]:
+        """
+        Look up cleaned text from an earlier run.
+
+        Args:
+            key: Cache key from make_text_key
+
+        Returns:
+            Dict with cleaned_text, removed and audit_log, or None on a miss
+        """
+        if self.refresh:
+            return None
+        try:
+            with open(self._cleaned_entry(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def store_cleaned(self, key: str, cleaned: dict):
+        """
+        Save cleaned text for later runs.
+
+        Args:
+            key: Cache key from make_text_key
+            cleaned: Dict with cleaned_text, removed and audit_log
+        """
+        path = self._cleaned_entry(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cleaned, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -3,12 +3,20 @@ File Handler Utilities
 Manages file I/O, timestamp-based folder creation, and XLSX conversion.
 """
 import os
+import json
+import mmap
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple
-import openpyxl
-import pandas as pd
+from typing import List, Optional, Tuple
+
+# orjson is optional - much faster for large JSON outputs, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class FileHandler:
@@ -80,13 +88,49 @@ class FileHandler:
             elif input_path.suffix.lower() in ['.xlsx', '.xls']:
                 xlsx_files.append(input_path)
         elif input_path.is_dir():
-            pdf_files = list(input_path.glob("**/*.pdf"))
-            xlsx_files = list(input_path.glob("**/*.xlsx")) + list(input_path.glob("**/*.xls"))
+            # One walk classifies every entry (instead of a tree walk per extension)
+            found = {".pdf": [], ".xlsx": [], ".xls": []}
+            FileHandler._scan_tree(str(input_path), found)
+            pdf_files = [Path(p) for p in found[".pdf"]]
+            xlsx_files = [Path(p) for p in found[".xlsx"] + found[".xls"]]
         else:
             raise FileNotFoundError(f"Input path not found: {input_path}")
         
         return pdf_files, xlsx_files
     
+    @staticmethod
+    def _scan_tree(root: str, found: dict):
+        """
+        Recursively collect paths under root into found[extension], in the same order as
+        Path.glob("**/*<ext>"): each directory's matches, then its subdirectories
+        depth-first. Symlinked directories are not followed, as with glob.
+        
+        Args:
+            root: Directory to walk
+            found: Mapping of extension (e.g. ".pdf") to the list collecting its paths
+        """
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        subdirs = []
+        for entry in entries:
+            dot = entry.name.rfind(".")
+            if dot >= 0:
+                bucket = found.get(os.path.normcase(entry.name[dot:]))
+                if bucket is not None:
+                    bucket.append(entry.path)
+            try:
+                if entry.is_dir() and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            except OSError:
+                pass
+        
+        for subdir in subdirs:
+            FileHandler._scan_tree(subdir, found)
+    
     @staticmethod
     def xlsx_to_text(xlsx_path: Path, row_limit: int = 50) -> str:
         """
@@ -99,6 +143,10 @@ class FileHandler:
         Returns:
             Text representation of all sheets (up to row_limit each)
         """
+        # Lazy imports: openpyxl/pandas are only needed when XLSX attachments exist
+        import openpyxl
+        import pandas as pd
+        
         text_parts = []
         
         try:
@@ -132,6 +180,24 @@ class FileHandler:
         except Exception as e:
             return f"[Error reading XLSX: {str(e)}]"
     
+    @staticmethod
+    def map_file(path: Path) -> Optional[mmap.mmap]:
+        """
+        Memory-map a file read-only so several readers share one view of it.
+        
+        Args:
+            path: File to map
+        
+        Returns:
+            The mapping (usable as a seekable binary file or bytes-like object; caller closes it),
+            or None if the file cannot be mapped (e.g. it is empty)
+        """
+        try:
+            with open(path, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    
     @staticmethod
     def save_text(content: str, output_path: Path):
         """
@@ -145,6 +211,19 @@ class FileHandler:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
     
+    @staticmethod
+    def save_text_parts(parts: list, output_path: Path):
+        """
+        Save text given as parts, without joining them in memory first.
+        
+        Args:
+            parts: Text parts, written in order
+            output_path: Destination file path
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.writelines(parts)
+    
     @staticmethod
     def save_json(content: str, output_path: Path):
         """
@@ -158,6 +237,51 @@ class FileHandler:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
     
+    @staticmethod
+    def save_json_stream(data, output_path: Path, compact: bool = False):
+        """
+        Serialize data to a JSON file.
+        
+        With orjson installed the whole document is encoded to UTF-8 bytes in one (much faster)
+        call and written at once. The layout matches json.dump(indent=2, ensure_ascii=False), but
+        floats are spelled differently (1e-05 is written 0.00001, 2.5e-07 as 2.5e-7) and NaN/Infinity
+        are written as null rather than the non-standard NaN/Infinity tokens.
+        Without orjson, json.dump streams the output to the file instead of building the full string.
+        
+        Args:
+            data: JSON-serializable object
+            output_path: Destination file path
+            compact: If True, write without indentation/whitespace (for machine-read files)
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if ORJSON_AVAILABLE:
+            # orjson emits UTF-8 bytes directly (float spelling and NaN differ - see docstring)
+            option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+            output_path.write_bytes(orjson.dumps(data, option=option))
+            return
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if compact:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            else:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def save_json_many(items: List[Tuple[object, Path]], compact: bool = False):
+        """
+        Write several JSON files at once, overlapping their file I/O on a small thread pool.
+        
+        Args:
+            items: (data, output_path) pairs
+            compact: If True, write without indentation/whitespace
+        """
+        if len(items) <= 1:
+            for data, output_path in items:
+                FileHandler.save_json_stream(data, output_path, compact)
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+            # list() re-raises the first write error, if any
+            list(executor.map(lambda item: FileHandler.save_json_stream(item[0], item[1], compact), items))
+    
     @staticmethod
     def read_file(file_path: Path) -> str:
         """
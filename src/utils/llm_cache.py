@@ -0,0 +1,110 @@
+"""
+LLM Response Cache
+Persists raw LLM predictions on disk, keyed by a SHA256 of the prompt, model settings and DSPy program.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+# orjson is optional - faster (de)serialization of cached responses, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class LLMCache:
+    """
+    Deterministic on-disk cache for raw LLM predictions (post-processing is re-run on a hit).
+
+    Modes:
+        enabled  - read hits, write misses (default)
+        replay   - read hits only; a miss is an error (no LLM calls are made)
+        disabled - bypass the cache entirely
+    """
+
+    MODES = ("enabled", "replay", "disabled")
+
+    def __init__(self, cache_dir: Path, mode: str = "enabled"):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cached responses
+            mode: One of MODES
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {self.MODES}")
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int, top_p: float, program: str) -> str:
+        """
+        Build the cache key for an LLM call.
+
+        Args:
+            prompt: Full context sent to the LLM
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Max output tokens
+            top_p: Nucleus sampling parameter
+            program: Fingerprint of the DSPy program (signature, demos, extractor code),
+                so prompt or demo changes never reuse stale responses
+
+        Returns:
+            Hex SHA256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(prompt.encode("utf-8"))
+        digest.update(f"\x00{model}\x00{temperature}\x00{max_tokens}\x00{top_p}\x00{program}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached value, or None on a miss (or when the cache is disabled)
+        """
+        if self.mode == "disabled":
+            return None
+        path = self._path(key)
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(path.read_bytes())
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:  # Corrupt entry (json.JSONDecodeError / orjson.JSONDecodeError)
+            return None
+
+    def put(self, key: str, value: Any):
+        """
+        Store a value. Written to a temp file and renamed so readers never see partial JSON.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable value
+        """
+        if self.mode != "enabled":
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{id(value)}.tmp")
+        if ORJSON_AVAILABLE:
+            tmp_path.write_bytes(orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
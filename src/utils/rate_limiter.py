@@ -0,0 +1,70 @@
+"""
+LLM Rate Limiter
+Token-bucket pacing for requests-per-minute and tokens-per-minute provider limits.
+"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """
+    Paces LLM calls so a concurrent batch stays under the provider's RPM/TPM limits
+    instead of bursting into 429 errors and retries.
+
+    Two buckets refill continuously at R/60 and T/60 per second. Each call reserves
+    one request and its estimated tokens up front; callers that overdraw a bucket
+    wait until it has refilled, so concurrent callers queue in arrival order.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = 0):
+        """
+        Initialize limiter with both buckets full.
+
+        Args:
+            requests_per_minute: Max requests per minute (0 = unlimited)
+            tokens_per_minute: Max prompt + completion tokens per minute (0 = unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_tokens = float(requests_per_minute)
+        self._token_tokens = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Refill both buckets, reserve capacity for one call and return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+
+            wait = 0.0
+            if self.requests_per_minute > 0:
+                rate = self.requests_per_minute / 60
+                self._request_tokens = min(self.requests_per_minute, self._request_tokens + elapsed * rate)
+                wait = max(wait, (1 - self._request_tokens) / rate)
+                self._request_tokens -= 1
+
+            if self.tokens_per_minute > 0:
+                rate = self.tokens_per_minute / 60
+                # A single call larger than the bucket would otherwise never be admitted
+                cost = min(estimated_tokens, self.tokens_per_minute)
+                self._token_tokens = min(self.tokens_per_minute, self._token_tokens + elapsed * rate)
+                wait = max(wait, (cost - self._token_tokens) / rate)
+                self._token_tokens -= cost
+
+            return wait
+
+    def acquire(self, estimated_tokens: int = 0):
+        """Block until a call of estimated_tokens may be sent."""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens: int = 0):
+        """Async variant of acquire() that yields to the event loop while waiting."""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
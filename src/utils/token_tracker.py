@@ -2,7 +2,9 @@
 Token Tracking and Cost Calculation
 Handles token counting and usage cost estimation for various models.
 """
-import tiktoken
+import hashlib
+import threading
+from functools import lru_cache
 from typing import Dict, Tuple
 
 
@@ -40,6 +42,12 @@ class TokenTracker:
         "qwen/qwen3-32b": (0.08, 0.24),
     }
     
+    # Prompt-cache hits are billed at this fraction of the input price
+    CACHED_INPUT_PRICE_RATIO = 0.5
+    
+    # Token counts kept per tracker (one tracker serves a whole batch)
+    TOKEN_COUNT_CACHE_SIZE = 256
+    
     def __init__(self, model: str = "openai/gpt-4o"):
         """
         Initialize token tracker.
@@ -48,11 +56,20 @@ class TokenTracker:
             model: Model identifier for pricing lookup
         """
         self.model = model
-        self.encoding = self._get_encoding(model)
+        # Keyed by a digest of the text, so large prompts are not kept alive by the cache
+        self._token_counts: Dict[bytes, int] = {}
+        self._token_counts_lock = threading.Lock()
+    
+    @property
+    def encoding(self):
+        """tiktoken encoding, loaded on first use (cost-only callers never need it)."""
+        return self._get_encoding(self.model)
     
     @staticmethod
+    @lru_cache(maxsize=32)
     def _get_encoding(model: str):
-        """Get appropriate tiktoken encoding for model."""
+        """Get appropriate tiktoken encoding for model (memoized per model)."""
+        import tiktoken  # Lazy import: loading encodings is slow and may hit the network
         try:
             # Most OpenRouter models use cl100k_base encoding
             return tiktoken.get_encoding("cl100k_base")
@@ -70,37 +87,54 @@ class TokenTracker:
         Returns:
             Token count
         """
-        return len(self.encoding.encode(text))
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._token_counts_lock:
+            count = self._token_counts.get(key)
+        if count is None:
+            count = len(self.encoding.encode(text))
+            with self._token_counts_lock:
+                if len(self._token_counts) >= self.TOKEN_COUNT_CACHE_SIZE:
+                    # Drop the oldest entry
+                    del self._token_counts[next(iter(self._token_counts))]
+                self._token_counts[key] = count
+        return count
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _resolve_pricing(cls, model: str) -> Tuple[float, float]:
+        """Resolve (input, output) price per 1M tokens for a model (memoized per model)."""
+        # Normalize model name (remove provider prefix if present for lookup)
+        lookup_model = model.replace("openrouter/", "").replace("openai/", "")
+
+        # Try direct lookup, then normalized, then default
+        if model in cls.PRICING:
+            pricing = cls.PRICING[model]
+        elif lookup_model in cls.PRICING:
+            pricing = cls.PRICING[lookup_model]
+        else:
+            # Fallback to similar model or default
+            # Check for partial matches (e.g. qwen/qwen-2.5...)
+            match = next((k for k in cls.PRICING if k in model), "openai/gpt-4o")
+            pricing = cls.PRICING[match]
+        return pricing
     
-    def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+    def calculate_cost(self, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
         """
         Calculate cost for token usage.
         
         Args:
-            input_tokens: Number of input tokens
+            input_tokens: Number of input tokens (including cached ones)
             output_tokens: Number of output tokens
+            cached_tokens: Input tokens served from the provider's prompt cache
         
         Returns:
             Total cost in USD
         """
-        # Normalize model name (remove provider prefix if present for lookup)
-        lookup_model = self.model.replace("openrouter/", "").replace("openai/", "")
-        
-        # Try direct lookup, then normalized, then default
-        if self.model in self.PRICING:
-            pricing = self.PRICING[self.model]
-        elif lookup_model in self.PRICING:
-            pricing = self.PRICING[lookup_model]
-        else:
-            # Fallback to similar model or default
-            # Check for partial matches (e.g. qwen/qwen-2.5...)
-            match = next((k for k in self.PRICING if k in self.model), "openai/gpt-4o")
-            pricing = self.PRICING[match]
-            
-        input_price, output_price = pricing
+        input_price, output_price = self._resolve_pricing(self.model)
         
         # Calculate cost
-        input_cost = (input_tokens / 1_000_000) * input_price
+        billed_input_tokens = input_tokens - cached_tokens + cached_tokens * self.CACHED_INPUT_PRICE_RATIO
+        input_cost = (billed_input_tokens / 1_000_000) * input_price
         output_cost = (output_tokens / 1_000_000) * output_price
         
         return input_cost + output_cost